@@ -176,7 +176,7 @@ async def generate_try_on_with_image(
         # Process user image
         image_data = await user_image.read()
         try:
-            processed_image = prepare_image_for_ai(image_data)
+            processed_image = await prepare_image_for_ai(image_data)
         except ImageProcessingError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File, Query, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 import logging
 
 from ...core.security import get_current_user_uid, get_current_user
+from ...core.rate_limit import enforce_write_rate_limit
 from ...models.wardrobe import (
     ClothingItemCreate, ClothingItemUpdate, ClothingItemResponse,
     OutfitCreate, OutfitUpdate, OutfitResponse,
     ClothingCategory, ClothingSize
 )
-from ...services.wardrobe_service import ClothingItemService, OutfitService
+from ...services.wardrobe_service import ClothingItemService, OutfitService, encode_responses
 
 logger = logging.getLogger(__name__)
 
@@ -25,13 +27,17 @@ async def get_clothing_items(
     is_favorite: Optional[bool] = Query(None, description="Filter by favorite status"),
     tags: Optional[str] = Query(None, description="Filter by tags (comma-separated)"),
     limit: Optional[int] = Query(50, ge=1, le=100, description="Number of items to return"),
-    offset: Optional[int] = Query(0, ge=0, description="Number of items to skip")
+    offset: Optional[int] = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[float] = Query(None, description="created_at of the last item from the previous page (keyset pagination; overrides offset)")
 ):
     """
     Get user's clothing items with optional filtering
 
     Returns a list of clothing items belonging to the authenticated user.
     Supports filtering by category, size, brand, favorite status, and tags.
+    For deep pagination pass the created_at of the last item as `cursor`
+    instead of growing `offset` - the query then resumes after that point
+    rather than reading and discarding the skipped rows.
     """
     filters = {}
     if category:
@@ -47,11 +53,60 @@ async def get_clothing_items(
         if tag_list:
             filters['tags'] = tag_list
 
-    return await ClothingItemService.get_user_clothing_items(
+    items = await ClothingItemService.get_user_clothing_items(
         current_user_uid,
         filters=filters,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=cursor
+    )
+    # Hot list path: items are trusted outbound data, so encode them to
+    # bytes directly instead of re-validating through the response model
+    return Response(encode_responses(items), media_type="application/json")
+
+@router.get("/clothing-items/stream")
+async def stream_clothing_items(
+    current_user_uid: str = Depends(get_current_user_uid),
+    category: Optional[ClothingCategory] = Query(None, description="Filter by category"),
+    size: Optional[ClothingSize] = Query(None, description="Filter by size"),
+    brand: Optional[str] = Query(None, description="Filter by brand"),
+    is_favorite: Optional[bool] = Query(None, description="Filter by favorite status"),
+    tags: Optional[str] = Query(None, description="Filter by tags (comma-separated)"),
+    limit: Optional[int] = Query(50, ge=1, le=500, description="Number of items to return"),
+    offset: Optional[int] = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[float] = Query(None, description="created_at of the last item from the previous page (keyset pagination; overrides offset)")
+):
+    """
+    Stream user's clothing items as NDJSON
+
+    Same filters as the list endpoint, but items are flushed one JSON
+    line at a time as they arrive from the database instead of being
+    buffered into a single response, which keeps memory flat for large
+    wardrobes.
+    """
+    filters = {}
+    if category:
+        filters['category'] = category.value
+    if size:
+        filters['size'] = size.value
+    if brand:
+        filters['brand'] = brand
+    if is_favorite is not None:
+        filters['is_favorite'] = is_favorite
+    if tags:
+        tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        if tag_list:
+            filters['tags'] = tag_list
+
+    return StreamingResponse(
+        ClothingItemService.stream_user_clothing_items(
+            current_user_uid,
+            filters=filters,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        ),
+        media_type="application/x-ndjson"
     )
 
 @router.get("/clothing-items/{item_id}", response_model=ClothingItemResponse)
@@ -150,11 +205,27 @@ async def delete_clothing_item(
 
     return {"message": "Clothing item deleted successfully"}
 
+@router.post("/clothing-items/bulk-delete", response_model=Dict[str, Any])
+async def bulk_delete_clothing_items(
+    item_ids: List[str],
+    current_user_uid: str = Depends(get_current_user_uid)
+):
+    """
+    Delete several clothing items at once
+
+    Verifies ownership of the whole batch with one query and removes the
+    items in a single batched write, so cleaning up N items costs one
+    round-trip instead of N.
+    """
+    deleted = await ClothingItemService.delete_clothing_items(current_user_uid, item_ids)
+    return {"message": "Clothing items deleted successfully", "deleted": deleted}
+
 @router.post("/clothing-items/{item_id}/images", response_model=Dict[str, Any])
 async def upload_clothing_item_images(
     item_id: str,
     files: List[UploadFile] = File(...),
-    current_user_uid: str = Depends(get_current_user_uid)
+    current_user_uid: str = Depends(get_current_user_uid),
+    _rate_limit: None = Depends(enforce_write_rate_limit)
 ):
     logger.info(f"Image upload endpoint hit: item_id={item_id}, files={len(files)}, user={current_user_uid}")
     """
@@ -218,7 +289,8 @@ async def delete_clothing_item_images(
 @router.post("/clothing-items/{item_id}/wear", response_model=ClothingItemResponse)
 async def record_clothing_item_wear(
     item_id: str,
-    current_user_uid: str = Depends(get_current_user_uid)
+    current_user_uid: str = Depends(get_current_user_uid),
+    _rate_limit: None = Depends(enforce_write_rate_limit)
 ):
     """
     Record that a clothing item was worn
@@ -252,13 +324,16 @@ async def get_outfits(
     is_favorite: Optional[bool] = Query(None, description="Filter by favorite status"),
     tags: Optional[str] = Query(None, description="Filter by tags (comma-separated)"),
     limit: Optional[int] = Query(50, ge=1, le=100, description="Number of outfits to return"),
-    offset: Optional[int] = Query(0, ge=0, description="Number of outfits to skip")
+    offset: Optional[int] = Query(0, ge=0, description="Number of outfits to skip"),
+    cursor: Optional[float] = Query(None, description="created_at of the last outfit from the previous page (keyset pagination; overrides offset)")
 ):
     """
     Get user's outfits with optional filtering
 
     Returns a list of outfits belonging to the authenticated user.
     Supports filtering by occasion, season, weather, favorite status, and tags.
+    For deep pagination pass the created_at of the last outfit as `cursor`
+    instead of growing `offset`.
     """
     filters = {}
     if occasion:
@@ -274,11 +349,58 @@ async def get_outfits(
         if tag_list:
             filters['tags'] = tag_list
 
-    return await OutfitService.get_user_outfits(
+    outfits = await OutfitService.get_user_outfits(
         current_user_uid,
         filters=filters,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=cursor
+    )
+    # Hot list path: outfits are trusted outbound data, so encode them to
+    # bytes directly instead of re-validating through the response model
+    return Response(encode_responses(outfits), media_type="application/json")
+
+@router.get("/outfits/stream")
+async def stream_outfits(
+    current_user_uid: str = Depends(get_current_user_uid),
+    occasion: Optional[str] = Query(None, description="Filter by occasion"),
+    season: Optional[str] = Query(None, description="Filter by season"),
+    weather: Optional[str] = Query(None, description="Filter by weather"),
+    is_favorite: Optional[bool] = Query(None, description="Filter by favorite status"),
+    tags: Optional[str] = Query(None, description="Filter by tags (comma-separated)"),
+    limit: Optional[int] = Query(50, ge=1, le=500, description="Number of outfits to return"),
+    offset: Optional[int] = Query(0, ge=0, description="Number of outfits to skip"),
+    cursor: Optional[float] = Query(None, description="created_at of the last outfit from the previous page (keyset pagination; overrides offset)")
+):
+    """
+    Stream user's outfits as NDJSON
+
+    Streaming counterpart of the outfit list endpoint - one JSON line
+    per outfit, flushed as the documents arrive.
+    """
+    filters = {}
+    if occasion:
+        filters['occasion'] = occasion
+    if season:
+        filters['season'] = season
+    if weather:
+        filters['weather'] = weather
+    if is_favorite is not None:
+        filters['is_favorite'] = is_favorite
+    if tags:
+        tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        if tag_list:
+            filters['tags'] = tag_list
+
+    return StreamingResponse(
+        OutfitService.stream_user_outfits(
+            current_user_uid,
+            filters=filters,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        ),
+        media_type="application/x-ndjson"
     )
 
 @router.get("/outfits/{outfit_id}", response_model=OutfitResponse)
@@ -378,10 +500,25 @@ async def delete_outfit(
 
     return {"message": "Outfit deleted successfully"}
 
+@router.post("/outfits/bulk-delete", response_model=Dict[str, Any])
+async def bulk_delete_outfits(
+    outfit_ids: List[str],
+    current_user_uid: str = Depends(get_current_user_uid)
+):
+    """
+    Delete several outfits at once
+
+    Batched counterpart of the single outfit delete - one ownership
+    query and one batched write for the whole list.
+    """
+    deleted = await OutfitService.delete_outfits(current_user_uid, outfit_ids)
+    return {"message": "Outfits deleted successfully", "deleted": deleted}
+
 @router.post("/outfits/{outfit_id}/wear", response_model=OutfitResponse)
 async def record_outfit_wear(
     outfit_id: str,
-    current_user_uid: str = Depends(get_current_user_uid)
+    current_user_uid: str = Depends(get_current_user_uid),
+    _rate_limit: None = Depends(enforce_write_rate_limit)
 ):
     """
     Record that an outfit was worn
@@ -408,7 +545,8 @@ async def record_outfit_wear(
 async def upload_outfit_image(
     outfit_id: str,
     file: UploadFile = File(...),
-    current_user_uid: str = Depends(get_current_user_uid)
+    current_user_uid: str = Depends(get_current_user_uid),
+    _rate_limit: None = Depends(enforce_write_rate_limit)
 ):
     """
     Upload an image for an outfit
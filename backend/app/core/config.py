@@ -25,6 +25,11 @@ class Settings(BaseSettings):
     google_ai_rate_limit_requests_per_minute: int = Field(60, alias="GOOGLE_AI_RATE_LIMIT_RPM")
     google_ai_rate_limit_tokens_per_minute: int = Field(10000, alias="GOOGLE_AI_RATE_LIMIT_TPM")
     google_ai_timeout_seconds: int = Field(30, alias="GOOGLE_AI_TIMEOUT")
+    google_ai_usage_history_max: int = Field(10000, alias="GOOGLE_AI_USAGE_HISTORY_MAX")
+    google_ai_max_concurrent: int = Field(16, alias="GOOGLE_AI_MAX_CONCURRENT")
+
+    # Warm Firestore/Storage channels at startup (disable in tests)
+    warm_connections_on_startup: bool = Field(True, alias="WARM_CONNECTIONS_ON_STARTUP")
 
     # Security
     jwt_algorithm: str = "RS256"
@@ -1,13 +1,75 @@
 import firebase_admin
 from firebase_admin import credentials, firestore, storage, auth
+from google.api_core.exceptions import AlreadyExists
 from google.cloud import firestore as firestore_client
 from google.cloud import storage as gcs_client
 from typing import Optional, Dict, Any, List
+import contextvars
 import logging
+import threading
+import time
 from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Request-scoped document cache, activated per request by middleware in
+# app.main. While active, repeat reads of the same document within one
+# request are served from memory; every write invalidates its entry.
+# Outside a request (scripts, tests) the default None disables caching.
+_request_doc_cache: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "request_doc_cache", default=None
+)
+
+def begin_request_doc_cache():
+    """Activate the per-request document cache; returns a reset token"""
+    return _request_doc_cache.set({})
+
+def end_request_doc_cache(token):
+    """Deactivate the per-request document cache"""
+    _request_doc_cache.reset(token)
+
+# Cross-request TTL cache for hot outfit documents. Most outfit reads
+# exist only to verify user_uid ownership before a write, so a short
+# staleness window is safe: every write helper in this module
+# invalidates its entry, and ownership never changes after creation.
+# Per-process and lock-guarded; entries expire lazily.
+_DOC_TTL_SECONDS = 60
+_DOC_TTL_MAX_ENTRIES = 10_000
+_TTL_CACHED_COLLECTIONS = frozenset({"outfits"})
+_doc_ttl_cache: Dict[tuple, tuple] = {}
+_doc_ttl_lock = threading.Lock()
+
+def _ttl_cache_get(key: tuple) -> Optional[dict]:
+    with _doc_ttl_lock:
+        entry = _doc_ttl_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            del _doc_ttl_cache[key]
+            return None
+        # Shallow copy - converters rewrite fields in place
+        return dict(data)
+
+def _ttl_cache_put(key: tuple, data: dict):
+    with _doc_ttl_lock:
+        if len(_doc_ttl_cache) >= _DOC_TTL_MAX_ENTRIES:
+            # Drop expired entries; if everything is still fresh, start
+            # over rather than grow without bound
+            now = time.monotonic()
+            live = {k: v for k, v in _doc_ttl_cache.items() if v[0] > now}
+            _doc_ttl_cache.clear()
+            if len(live) < _DOC_TTL_MAX_ENTRIES:
+                _doc_ttl_cache.update(live)
+        _doc_ttl_cache[key] = (time.monotonic() + _DOC_TTL_SECONDS, dict(data))
+
+def _invalidate_cached_doc(collection: str, document_id: str):
+    cache = _request_doc_cache.get()
+    if cache is not None:
+        cache.pop((collection, document_id), None)
+    with _doc_ttl_lock:
+        _doc_ttl_cache.pop((collection, document_id), None)
+
 # Global Firebase clients
 _firestore_client: Optional[firestore_client.Client] = None
 _storage_client: Optional[gcs_client.Client] = None
@@ -73,6 +135,25 @@ def initialize_firebase() -> bool:
         logger.error(f"Failed to initialize Firebase: {str(e)}")
         return False
 
+def warm_connections():
+    """Issue no-op RPCs so the first real request hits warm channels
+
+    Forces the TLS handshake and gRPC/HTTP2 channel setup for Firestore
+    and Storage at startup instead of on the first user request.
+    """
+    try:
+        db = get_firestore_client()
+        if db:
+            list(db.collection("users").limit(1).stream())
+
+        bucket = get_storage_bucket()
+        if bucket:
+            bucket.exists()
+
+        logger.info("Firebase connections warmed")
+    except Exception as e:
+        logger.warning(f"Connection warmup failed: {str(e)}")
+
 def get_firestore_client() -> Optional[firestore_client.Client]:
     """Get Firestore client instance"""
     if _firestore_client is None:
@@ -124,15 +205,65 @@ class FirestoreHelper:
                 return False
 
             db.collection(collection).document(document_id).set(data)
+            _invalidate_cached_doc(collection, document_id)
+            logger.info(f"Document created: {collection}/{document_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error creating document {collection}/{document_id}: {str(e)}")
+            return False
+
+    @staticmethod
+    def create_document_if_absent(collection: str, document_id: str, data: dict) -> Optional[bool]:
+        """Create a document only if it does not already exist
+
+        Uses the conditional create() RPC, so duplicate detection costs no
+        extra read. Returns True on success, None if the document already
+        exists and False on other failures.
+        """
+        try:
+            db = get_firestore_client()
+            if not db:
+                return False
+
+            db.collection(collection).document(document_id).create(data)
+            _invalidate_cached_doc(collection, document_id)
             logger.info(f"Document created: {collection}/{document_id}")
             return True
+        except AlreadyExists:
+            logger.info(f"Document already exists: {collection}/{document_id}")
+            return None
         except Exception as e:
             logger.error(f"Error creating document {collection}/{document_id}: {str(e)}")
             return False
 
+    @staticmethod
+    def batch() -> Optional[firestore_client.WriteBatch]:
+        """Get a write batch for grouping document writes into one commit"""
+        db = get_firestore_client()
+        if not db:
+            return None
+        return db.batch()
+
     @staticmethod
     def get_document(collection: str, document_id: str) -> Optional[dict]:
         """Get a document from Firestore"""
+        cache = _request_doc_cache.get()
+        key = (collection, document_id)
+        if cache is not None and key in cache:
+            cached = cache[key]
+            # Hand out a shallow copy - model from_firestore converters
+            # rewrite fields in place
+            return dict(cached) if cached is not None else None
+
+        use_ttl = collection in _TTL_CACHED_COLLECTIONS
+        if use_ttl:
+            data = _ttl_cache_get(key)
+            if data is not None:
+                logger.debug(f"TTL doc cache hit for {collection}/{document_id}")
+                if cache is not None:
+                    cache[key] = dict(data)
+                return data
+
         try:
             db = get_firestore_client()
             if not db:
@@ -141,13 +272,163 @@ class FirestoreHelper:
             doc_ref = db.collection(collection).document(document_id)
             doc = doc_ref.get()
 
-            if doc.exists:
-                return doc.to_dict()
-            return None
+            data = doc.to_dict() if doc.exists else None
+            if cache is not None:
+                cache[key] = dict(data) if data is not None else None
+            if use_ttl and data is not None:
+                logger.debug(f"TTL doc cache miss for {collection}/{document_id}")
+                _ttl_cache_put(key, data)
+            return data
         except Exception as e:
             logger.error(f"Error getting document {collection}/{document_id}: {str(e)}")
             return None
 
+    @staticmethod
+    def atomic_increment(
+        collection: str,
+        document_id: str,
+        field: str,
+        amount: int = 1,
+        extra_fields: Optional[dict] = None
+    ) -> bool:
+        """Atomically increment a numeric field on a document
+
+        Uses a server-side Increment transform, so there is no prior read
+        and no read-modify-write race with concurrent writers. Any
+        extra_fields are written in the same update.
+        """
+        try:
+            db = get_firestore_client()
+            if not db:
+                return False
+
+            update = {field: firestore_client.Increment(amount)}
+            if extra_fields:
+                update.update(extra_fields)
+            db.collection(collection).document(document_id).update(update)
+            _invalidate_cached_doc(collection, document_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error incrementing {field} on {collection}/{document_id}: {str(e)}")
+            return False
+
+    @staticmethod
+    def batch_increment(ops: List[tuple]) -> bool:
+        """Atomically increment fields on many documents in one commit
+
+        Each op is (collection, document_id, field, extra_fields). Every
+        increment rides a server-side Increment transform inside a
+        WriteBatch, so the whole set costs one RPC per 450 writes
+        instead of one per document, with no read-modify-write race.
+        """
+        try:
+            db = get_firestore_client()
+            if not db:
+                return False
+
+            # Stay under Firestore's per-commit write limit
+            for start in range(0, len(ops), 450):
+                batch = db.batch()
+                for collection, document_id, field, extra_fields in ops[start:start + 450]:
+                    update = {field: firestore_client.Increment(1)}
+                    if extra_fields:
+                        update.update(extra_fields)
+                    batch.update(db.collection(collection).document(document_id), update)
+                batch.commit()
+
+            for collection, document_id, _, _ in ops:
+                _invalidate_cached_doc(collection, document_id)
+
+            logger.info(f"Batch incremented {len(ops)} documents")
+            return True
+        except Exception as e:
+            logger.error(f"Error batch incrementing documents: {str(e)}")
+            return False
+
+    @staticmethod
+    def array_union(
+        collection: str,
+        document_id: str,
+        field: str,
+        values: List[Any],
+        extra_fields: Optional[dict] = None
+    ) -> bool:
+        """Append values to an array field with a server-side transform
+
+        ArrayUnion sends only the new elements instead of rewriting the
+        whole array, and deduplicates on the server. Any extra_fields are
+        written in the same update.
+        """
+        try:
+            db = get_firestore_client()
+            if not db:
+                return False
+
+            update = {field: firestore_client.ArrayUnion(values)}
+            if extra_fields:
+                update.update(extra_fields)
+            db.collection(collection).document(document_id).update(update)
+            _invalidate_cached_doc(collection, document_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error appending to {field} on {collection}/{document_id}: {str(e)}")
+            return False
+
+    @staticmethod
+    def get_documents(collection: str, document_ids: List[str]) -> Dict[str, dict]:
+        """Fetch several documents from a collection in one batch read
+
+        get_all retrieves every requested document over a single round-trip
+        instead of one per ID. Returns a mapping of document ID to data for
+        the documents that exist.
+        """
+        try:
+            db = get_firestore_client()
+            if not db or not document_ids:
+                return {}
+
+            refs = [db.collection(collection).document(doc_id) for doc_id in document_ids]
+            return {snap.id: snap.to_dict() for snap in db.get_all(refs) if snap.exists}
+        except Exception as e:
+            logger.error(f"Error batch reading documents from {collection}: {str(e)}")
+            return {}
+
+    @staticmethod
+    def verify_owned_documents(
+        collection: str,
+        owner_field: str,
+        owner_value: Any,
+        document_ids: List[str]
+    ) -> set:
+        """Return the subset of document_ids owned by owner_value
+
+        One indexed query per 30 ids (the Firestore `in` limit),
+        projected down to document names, so ownership of a whole batch
+        is checked without transferring any document payloads. Missing
+        ids mean the document does not exist or is not owned.
+        """
+        try:
+            db = get_firestore_client()
+            if not db or not document_ids:
+                return set()
+
+            coll = db.collection(collection)
+            ids = list(document_ids)
+            owned = set()
+            for start in range(0, len(ids), 30):
+                chunk = ids[start:start + 30]
+                query = (
+                    coll
+                    .where(owner_field, "==", owner_value)
+                    .where("__name__", "in", [coll.document(doc_id) for doc_id in chunk])
+                    .select(["__name__"])
+                )
+                owned.update(snap.id for snap in query.stream())
+            return owned
+        except Exception as e:
+            logger.error(f"Error verifying owned documents in {collection}: {str(e)}")
+            return set()
+
     @staticmethod
     def update_document(collection: str, document_id: str, data: dict) -> bool:
         """Update a document in Firestore"""
@@ -157,12 +438,96 @@ class FirestoreHelper:
                 return False
 
             db.collection(collection).document(document_id).update(data)
+            _invalidate_cached_doc(collection, document_id)
             logger.info(f"Document updated: {collection}/{document_id}")
             return True
         except Exception as e:
             logger.error(f"Error updating document {collection}/{document_id}: {str(e)}")
             return False
 
+    @staticmethod
+    def update_owned_document(
+        collection: str,
+        document_id: str,
+        owner_field: str,
+        owner_value: Any,
+        updater
+    ) -> Optional[dict]:
+        """Update a document after an ownership check, in one transaction
+
+        The ownership read and the write run inside a single Firestore
+        transaction, replacing the separate get-then-update round trip and
+        closing the race between the check and the mutation. ``updater``
+        receives the current document data and returns only the fields to
+        write, so unchanged fields are never resent. Returns the written
+        fields, or None if the document does not exist. Raises
+        PermissionError when owner_field does not match owner_value; other
+        errors propagate to the caller.
+        """
+        db = get_firestore_client()
+        if not db:
+            return None
+
+        doc_ref = db.collection(collection).document(document_id)
+
+        @firestore_client.transactional
+        def _update_in_transaction(transaction):
+            snapshot = doc_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+            doc_data = snapshot.to_dict()
+            if doc_data.get(owner_field) != owner_value:
+                raise PermissionError(
+                    f"Document {collection}/{document_id} not owned by {owner_value}"
+                )
+            new_data = updater(doc_data)
+            transaction.update(doc_ref, new_data)
+            return new_data
+
+        new_data = _update_in_transaction(db.transaction())
+        if new_data is not None:
+            _invalidate_cached_doc(collection, document_id)
+            logger.info(f"Document updated: {collection}/{document_id}")
+        return new_data
+
+    @staticmethod
+    def delete_owned_document(
+        collection: str,
+        document_id: str,
+        owner_field: str,
+        owner_value: Any
+    ) -> Optional[bool]:
+        """Delete a document after an ownership check, in one transaction
+
+        Transactional counterpart of delete_document for caller-owned
+        documents; see update_owned_document for the semantics. Returns
+        True when the document was deleted, or None if it does not exist.
+        Raises PermissionError when owner_field does not match owner_value.
+        """
+        db = get_firestore_client()
+        if not db:
+            return False
+
+        doc_ref = db.collection(collection).document(document_id)
+
+        @firestore_client.transactional
+        def _delete_in_transaction(transaction):
+            snapshot = doc_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+            if snapshot.to_dict().get(owner_field) != owner_value:
+                raise PermissionError(
+                    f"Document {collection}/{document_id} not owned by {owner_value}"
+                )
+            transaction.delete(doc_ref)
+            return True
+
+        deleted = _delete_in_transaction(db.transaction())
+        if deleted:
+            _invalidate_cached_doc(collection, document_id)
+            logger.info(f"Document deleted: {collection}/{document_id}")
+        return deleted
+
     @staticmethod
     def delete_document(collection: str, document_id: str) -> bool:
         """Delete a document from Firestore"""
@@ -172,21 +537,61 @@ class FirestoreHelper:
                 return False
 
             db.collection(collection).document(document_id).delete()
+            _invalidate_cached_doc(collection, document_id)
             logger.info(f"Document deleted: {collection}/{document_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting document {collection}/{document_id}: {str(e)}")
             return False
 
+    @staticmethod
+    def delete_documents(collection: str, document_ids: List[str]) -> bool:
+        """Delete several documents in batched commits
+
+        A WriteBatch commits up to 500 writes in one request, so N
+        deletes cost one round-trip per 500 instead of one each.
+        """
+        try:
+            db = get_firestore_client()
+            if not db:
+                return False
+
+            coll = db.collection(collection)
+            ids = list(document_ids)
+            for start in range(0, len(ids), 500):
+                batch = db.batch()
+                for doc_id in ids[start:start + 500]:
+                    batch.delete(coll.document(doc_id))
+                batch.commit()
+
+            for doc_id in ids:
+                _invalidate_cached_doc(collection, doc_id)
+            logger.info(f"Deleted {len(ids)} documents from {collection}")
+            return True
+        except Exception as e:
+            logger.error(f"Error batch deleting documents from {collection}: {str(e)}")
+            return False
+
     @staticmethod
     def query_documents(
         collection: str,
         filters: List[tuple] = None,
         order_by: List[tuple] = None,
         limit: int = None,
-        offset: int = None
+        offset: int = None,
+        select: List[str] = None,
+        start_after: Dict[str, Any] = None
     ) -> List[Dict[str, Any]]:
-        """Query documents from Firestore with filters and ordering"""
+        """Query documents from Firestore with filters and ordering
+
+        Pass ``select`` to apply a field mask so only the named fields
+        travel back from Firestore instead of whole documents.
+
+        Pass ``start_after`` (a dict of order_by field values from the
+        last document of the previous page) for keyset pagination: the
+        query resumes right after that position in O(limit), whereas
+        ``offset`` makes Firestore read and discard the skipped rows.
+        """
         try:
             db = get_firestore_client()
             if not db:
@@ -195,6 +600,10 @@ class FirestoreHelper:
             # Start with collection reference
             query = db.collection(collection)
 
+            # Apply field projection
+            if select:
+                query = query.select(select)
+
             # Apply filters
             if filters:
                 for field, operator, value in filters:
@@ -208,6 +617,10 @@ class FirestoreHelper:
                     else:
                         query = query.order_by(field, direction=firestore_client.Query.ASCENDING)
 
+            # Apply keyset cursor
+            if start_after:
+                query = query.start_after(start_after)
+
             # Apply offset
             if offset and offset > 0:
                 query = query.offset(offset)
@@ -230,4 +643,98 @@ class FirestoreHelper:
 
         except Exception as e:
             logger.error(f"Error querying documents from {collection}: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    def aggregate(
+        collection: str,
+        filters: List[tuple] = None,
+        sum_fields: List[str] = None,
+        avg_fields: List[str] = None
+    ) -> Dict[str, Any]:
+        """Run a server-side aggregation over a collection
+
+        Always counts the matching documents; pass sum_fields/avg_fields
+        for additional aggregations computed by Firestore. Returns a dict
+        with "count" plus "sum_<field>"/"avg_<field>" keys - scalars come
+        back over the wire instead of every document. Empty dict on error.
+        """
+        try:
+            db = get_firestore_client()
+            if not db:
+                return {}
+
+            query = db.collection(collection)
+            if filters:
+                for field, operator, value in filters:
+                    query = query.where(field, operator, value)
+
+            agg = query.count(alias="count")
+            for field in sum_fields or []:
+                agg = agg.sum(field, alias=f"sum_{field}")
+            for field in avg_fields or []:
+                agg = agg.avg(field, alias=f"avg_{field}")
+
+            results = {}
+            for bucket in agg.get():
+                for result in bucket:
+                    results[result.alias] = result.value
+            return results
+        except Exception as e:
+            logger.error(f"Error aggregating {collection}: {str(e)}")
+            return {}
+
+    @staticmethod
+    def stream_documents(
+        collection: str,
+        filters: List[tuple] = None,
+        order_by: List[tuple] = None,
+        limit: int = None,
+        offset: int = None,
+        start_after: Dict[str, Any] = None,
+        select: List[str] = None
+    ):
+        """Yield documents from Firestore one at a time
+
+        Generator counterpart of query_documents for callers that stream
+        results onward instead of materializing the full list. Supports
+        the same ``start_after`` keyset cursor and ``select`` field mask
+        as query_documents.
+        """
+        try:
+            db = get_firestore_client()
+            if not db:
+                return
+
+            query = db.collection(collection)
+
+            if select:
+                query = query.select(select)
+
+            if filters:
+                for field, operator, value in filters:
+                    query = query.where(field, operator, value)
+
+            if order_by:
+                for field, direction in order_by:
+                    if direction.lower() == "desc":
+                        query = query.order_by(field, direction=firestore_client.Query.DESCENDING)
+                    else:
+                        query = query.order_by(field, direction=firestore_client.Query.ASCENDING)
+
+            if start_after:
+                query = query.start_after(start_after)
+
+            if offset and offset > 0:
+                query = query.offset(offset)
+
+            if limit:
+                query = query.limit(limit)
+
+            for doc in query.stream():
+                doc_data = doc.to_dict()
+                doc_data['id'] = doc.id
+                yield doc_data
+
+        except Exception as e:
+            logger.error(f"Error streaming documents from {collection}: {str(e)}")
\ No newline at end of file
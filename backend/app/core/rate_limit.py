@@ -0,0 +1,80 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, status
+
+from .security import get_current_user_uid
+
+
+class RateLimiter:
+    """Fixed-window in-memory rate limiter keyed by caller uid
+
+    State is a plain dict guarded by a lock, so a rate check costs one
+    dict lookup - no Firestore reads or writes. Windows are tracked with
+    time.monotonic and entries reset lazily when their window expires.
+    Per-process only, which is the right trade-off here: the goal is to
+    stop bursts and accidental double-submits from multiplying Storage
+    uploads and Firestore writes, not to enforce a global quota.
+    """
+
+    def __init__(self, limit: int, window_seconds: float):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> Optional[int]:
+        """Consume one slot for key
+
+        Returns None when the call is allowed, otherwise the number of
+        seconds until the window resets (for the Retry-After header).
+        """
+        now = time.monotonic()
+        with self._lock:
+            count, reset_at = self._buckets.get(key, (0, 0.0))
+            if now >= reset_at:
+                count, reset_at = 0, now + self.window_seconds
+            if count >= self.limit:
+                return max(1, int(reset_at - now) + 1)
+            self._buckets[key] = (count + 1, reset_at)
+
+            # Prune expired entries opportunistically so the map doesn't
+            # grow without bound across many distinct users
+            if len(self._buckets) > 10_000:
+                self._buckets = {
+                    k: v for k, v in self._buckets.items() if v[1] > now
+                }
+        return None
+
+    def reset(self):
+        """Clear all buckets (used by tests)"""
+        with self._lock:
+            self._buckets.clear()
+
+
+# Expensive mutating endpoints (image uploads, wear recording) share
+# these per-user budgets
+write_limit_minute = RateLimiter(5, 60)
+write_limit_hour = RateLimiter(20, 3600)
+
+
+async def enforce_write_rate_limit(
+    current_user_uid: str = Depends(get_current_user_uid)
+) -> None:
+    """Dependency guarding expensive mutating endpoints
+
+    Rejects the request with 429 and a Retry-After header once the
+    authenticated user exhausts either the per-minute or per-hour
+    budget, before any Firestore or Storage work is done.
+    """
+    retry_after = (
+        write_limit_minute.acquire(current_user_uid)
+        or write_limit_hour.acquire(current_user_uid)
+    )
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please slow down",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,11 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import asyncio
 import uvicorn
 import logging
 from contextlib import asynccontextmanager
 
 from .core.config import get_settings
-from .core.firebase import initialize_firebase
+from .core.firebase import (
+    initialize_firebase,
+    warm_connections,
+    begin_request_doc_cache,
+    end_request_doc_cache,
+)
 from .core.logging import setup_logging
 from .api.endpoints import users, wardrobe, tryon
 
@@ -19,10 +26,22 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Ponpa Backend API...")
 
+    # Pillow-SIMD is a drop-in replacement for PIL with vectorized resampling;
+    # it reports versions like "9.0.0.post1". Flag images running stock Pillow
+    # so slow image processing in production is easy to diagnose.
+    import PIL
+    if "post" in PIL.__version__:
+        logger.info(f"Pillow-SIMD detected (PIL {PIL.__version__})")
+    else:
+        logger.info(f"Stock Pillow in use (PIL {PIL.__version__}); image ops will not be SIMD-accelerated")
+
     # Initialize Firebase
     firebase_initialized = initialize_firebase()
     if firebase_initialized:
         logger.info("Firebase initialized successfully")
+        # Pay the TLS/channel setup cost now, not on the first request
+        if get_settings().warm_connections_on_startup:
+            await asyncio.to_thread(warm_connections)
     else:
         logger.warning("Firebase initialization failed - continuing without Firebase features")
 
@@ -33,6 +52,14 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Ponpa Backend API...")
 
+    # Release the AI service's worker threads if it was ever created
+    from .services.ai_service import shutdown_ai_service
+    shutdown_ai_service()
+
+    # Release the image processing worker processes if the pool was created
+    from .utils.image_processing import shutdown_image_pool
+    shutdown_image_pool()
+
 # Get settings
 settings = get_settings()
 
@@ -42,7 +69,10 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes every JSON response; the hot list endpoints
+    # additionally bypass the encoder entirely via encode_responses
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -55,6 +85,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_document_cache(request, call_next):
+    """Dedupe repeat Firestore reads of the same document within a request"""
+    token = begin_request_doc_cache()
+    try:
+        return await call_next(request)
+    finally:
+        end_request_doc_cache(token)
+
 # Include routers
 app.include_router(users.router, prefix="/api/v1")
 app.include_router(wardrobe.router, prefix="/api/v1")
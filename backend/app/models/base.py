@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, ClassVar, Dict, Optional, get_args
 from pydantic import BaseModel, Field
 import time
 
@@ -9,20 +9,42 @@ class BaseFirestoreModel(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
+    # Per-class cache of the fields that can hold a datetime, computed
+    # once from model_fields instead of type-checking every field value
+    # on every to_firestore call
+    _datetime_fields_by_class: ClassVar[Dict[type, tuple]] = {}
+
+    @classmethod
+    def _datetime_fields(cls) -> tuple:
+        fields = BaseFirestoreModel._datetime_fields_by_class.get(cls)
+        if fields is None:
+            fields = tuple(
+                name for name, field in cls.model_fields.items()
+                if field.annotation is datetime or datetime in get_args(field.annotation)
+            )
+            BaseFirestoreModel._datetime_fields_by_class[cls] = fields
+        return fields
+
     def to_firestore(self) -> Dict[str, Any]:
         """Convert model to Firestore document format"""
         data = self.model_dump()
 
         # Convert datetime objects to Unix timestamps for Firestore
-        for key, value in data.items():
+        for key in self._datetime_fields():
+            value = data.get(key)
             if isinstance(value, datetime):
                 data[key] = int(value.timestamp())
 
         return data
 
     @classmethod
-    def from_firestore(cls, doc_data: Dict[str, Any], doc_id: str = None):
-        """Create model instance from Firestore document data"""
+    def from_firestore(cls, doc_data: Dict[str, Any], doc_id: str = None, trusted: bool = False):
+        """Create model instance from Firestore document data
+
+        Documents written by our own to_firestore were validated when they
+        were created; readers of such data can pass trusted=True to build
+        the model with model_construct and skip re-validation.
+        """
         if not doc_data:
             return None
 
@@ -35,11 +57,17 @@ class BaseFirestoreModel(BaseModel):
         if doc_id and hasattr(cls, 'id'):
             doc_data['id'] = doc_id
 
+        if trusted:
+            return cls.model_construct(**doc_data)
         return cls(**doc_data)
 
-    def update_timestamp(self):
-        """Update the updated_at timestamp"""
-        self.updated_at = datetime.now()
+    def update_timestamp(self, now: Optional[datetime] = None):
+        """Update the updated_at timestamp
+
+        Callers touching many documents at once can pass a shared `now`
+        to avoid re-reading the clock per document.
+        """
+        self.updated_at = now or datetime.now()
 
     model_config = {
         # Allow extra fields to be ignored during validation
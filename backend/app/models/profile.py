@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 from enum import Enum
 
 from .base import BaseFirestoreModel
@@ -129,6 +129,10 @@ class Profile(BaseFirestoreModel):
     profile_completion_percentage: float = Field(default=0.0, description="Profile completion percentage")
     onboarding_completed: bool = Field(default=False, description="Whether onboarding is completed")
 
+    # Hash of the scored fields from the last completion computation, so
+    # repeated updates that don't touch scored fields skip the rescan
+    _completion_cache_key: Optional[int] = PrivateAttr(default=None)
+
     @field_validator("bio")
     @classmethod
     def validate_bio(cls, v):
@@ -145,53 +149,47 @@ class Profile(BaseFirestoreModel):
             raise ValueError("Website URL must start with http:// or https://")
         return v
 
-    def calculate_completion_percentage(self) -> float:
-        """Calculate profile completion percentage"""
-        total_fields = 15  # Total number of important fields
-        completed_fields = 0
-
-        # Check basic info
-        if self.bio:
-            completed_fields += 1
-        if self.location:
-            completed_fields += 1
-
-        # Check measurements
+    def _completion_flags(self) -> tuple:
+        """Truthiness of each field that counts towards completion"""
         measurements = self.measurements
-        if measurements.height:
-            completed_fields += 1
-        if measurements.weight:
-            completed_fields += 1
-        if measurements.chest_bust:
-            completed_fields += 1
-        if measurements.waist:
-            completed_fields += 1
-        if measurements.hips:
-            completed_fields += 1
-        if measurements.shirt_size:
-            completed_fields += 1
-        if measurements.pants_size:
-            completed_fields += 1
-        if measurements.shoe_size:
-            completed_fields += 1
-
-        # Check style preferences
         style_prefs = self.style_preferences
-        if style_prefs.style_preferences:
-            completed_fields += 1
-        if style_prefs.preferred_colors:
-            completed_fields += 1
-        if style_prefs.primary_occasions:
-            completed_fields += 1
-        if style_prefs.budget_range_min and style_prefs.budget_range_max:
-            completed_fields += 1
-
-        # Check onboarding
-        if self.onboarding_completed:
-            completed_fields += 1
-
-        percentage = (completed_fields / total_fields) * 100
+        return (
+            # Basic info
+            bool(self.bio),
+            bool(self.location),
+            # Measurements
+            bool(measurements.height),
+            bool(measurements.weight),
+            bool(measurements.chest_bust),
+            bool(measurements.waist),
+            bool(measurements.hips),
+            bool(measurements.shirt_size),
+            bool(measurements.pants_size),
+            bool(measurements.shoe_size),
+            # Style preferences
+            bool(style_prefs.style_preferences),
+            bool(style_prefs.preferred_colors),
+            bool(style_prefs.primary_occasions),
+            bool(style_prefs.budget_range_min and style_prefs.budget_range_max),
+            # Onboarding
+            self.onboarding_completed,
+        )
+
+    def calculate_completion_percentage(self) -> float:
+        """Calculate profile completion percentage
+
+        Memoized on a hash of the scored fields - if nothing that counts
+        towards the score changed since the last call, the stored
+        percentage is returned as-is.
+        """
+        flags = self._completion_flags()
+        cache_key = hash(flags)
+        if cache_key == self._completion_cache_key:
+            return self.profile_completion_percentage
+
+        percentage = (sum(flags) / len(flags)) * 100
         self.profile_completion_percentage = round(percentage, 1)
+        self._completion_cache_key = cache_key
         return self.profile_completion_percentage
 
     def update_profile_completion(self):
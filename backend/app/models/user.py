@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field, field_validator, EmailStr
@@ -34,6 +35,9 @@ class User(BaseFirestoreModel):
 
     # Profile information
     profile_picture_url: Optional[str] = Field(None, description="URL to profile picture")
+    profile_picture_path: Optional[str] = Field(None, description="Storage object path of the profile picture")
+    profile_picture_thumbnail_url: Optional[str] = Field(None, description="URL to profile picture thumbnail")
+    profile_picture_thumbnail_path: Optional[str] = Field(None, description="Storage object path of the thumbnail")
     phone_number: Optional[str] = Field(None, description="Phone number")
     date_of_birth: Optional[datetime] = Field(None, description="Date of birth")
 
@@ -91,10 +95,11 @@ class User(BaseFirestoreModel):
         required_fields = [self.display_name or (self.first_name and self.last_name)]
         return all(required_fields)
 
-    def update_last_login(self):
+    def update_last_login(self, now: Optional[datetime] = None):
         """Update last login timestamp"""
-        self.last_login = datetime.now()
-        self.update_timestamp()
+        now = now or datetime.now()
+        self.last_login = now
+        self.update_timestamp(now)
 
     def to_firestore(self) -> Dict[str, Any]:
         """Convert to Firestore format with special handling for nested objects"""
@@ -151,8 +156,14 @@ class UserUpdate(BaseModel):
     date_of_birth: Optional[datetime] = None
     preferences: Optional[UserPreferences] = None
 
-class UserResponse(BaseModel):
-    """Model for user API responses (excludes sensitive data)"""
+@dataclass(slots=True)
+class UserResponse:
+    """Model for user API responses (excludes sensitive data)
+
+    Plain slots dataclass rather than a BaseModel: responses are built from
+    already-validated internal data, so re-running validation here would be
+    pure overhead. FastAPI still serializes it via response_model.
+    """
     uid: str
     email: str
     display_name: Optional[str]
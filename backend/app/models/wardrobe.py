@@ -1,11 +1,30 @@
+from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field, HttpUrl, validator
+import orjson
+from pydantic import BaseModel, Field, HttpUrl, field_validator
 
 from .base import BaseFirestoreModel
 
 
+def _validate_tags(v: List[str], max_tags: int) -> List[str]:
+    """Shared tags validator - pydantic-core caches the schema node across models"""
+    if len(v) > max_tags:
+        raise ValueError(f'Maximum {max_tags} tags allowed')
+    for tag in v:
+        if len(tag) > 30:
+            raise ValueError('Tag length must be 30 characters or less')
+    return v
+
+
+def _validate_max_length(v: list, max_items: int, message: str) -> list:
+    """Shared list length validator for image/item collections"""
+    if len(v) > max_items:
+        raise ValueError(message)
+    return v
+
+
 class ClothingCategory(str, Enum):
     """Enum for clothing categories"""
     TOPS = "tops"
@@ -78,26 +97,22 @@ class ClothingItem(BaseFirestoreModel):
     condition: Optional[str] = Field(None, description="Item condition")
     notes: Optional[str] = Field(None, max_length=1000, description="Personal notes")
 
-    @validator('tags')
+    @field_validator('tags')
+    @classmethod
     def validate_tags(cls, v):
-        if len(v) > 20:
-            raise ValueError('Maximum 20 tags allowed')
-        for tag in v:
-            if len(tag) > 30:
-                raise ValueError('Tag length must be 30 characters or less')
-        return v
-
-    @validator('image_urls')
+        return _validate_tags(v, 20)
+
+    @field_validator('image_urls')
+    @classmethod
     def validate_image_urls(cls, v):
-        if len(v) > 10:
-            raise ValueError('Maximum 10 images allowed')
-        return v
+        return _validate_max_length(v, 10, 'Maximum 10 images allowed')
 
-    def increment_wear_count(self):
+    def increment_wear_count(self, now: Optional[datetime] = None):
         """Increment wear count and update last worn date"""
+        now = now or datetime.now()
         self.wear_count += 1
-        self.last_worn = datetime.now()
-        self.update_timestamp()
+        self.last_worn = now
+        self.update_timestamp(now)
 
     def to_firestore(self) -> Dict[str, Any]:
         """Convert to Firestore document format"""
@@ -120,7 +135,7 @@ class ClothingItem(BaseFirestoreModel):
         return data
 
     @classmethod
-    def from_firestore(cls, doc_data: Dict[str, Any]) -> Optional['ClothingItem']:
+    def from_firestore(cls, doc_data: Dict[str, Any], trusted: bool = False) -> Optional['ClothingItem']:
         """Create instance from Firestore document"""
         if not doc_data:
             return None
@@ -133,9 +148,63 @@ class ClothingItem(BaseFirestoreModel):
 
         # Convert color dictionaries back to Color objects
         if 'colors' in doc_data and doc_data['colors']:
-            doc_data['colors'] = [Color(**color) for color in doc_data['colors']]
+            color_cls = Color.model_construct if trusted else Color
+            doc_data['colors'] = [color_cls(**color) for color in doc_data['colors']]
+
+        return super().from_firestore(doc_data, trusted=trusted)
 
-        return super().from_firestore(doc_data)
+    @classmethod
+    def batch_to_firestore_json(cls, items: List['ClothingItem']) -> bytes:
+        """Serialize many items into a single JSON payload for batch writes
+
+        Builds column-oriented arrays (one list per field) and encodes the
+        whole batch with one orjson call instead of building a dict per model.
+        """
+        columns = {
+            'id': [item.id for item in items],
+            'user_uid': [item.user_uid for item in items],
+            'name': [item.name for item in items],
+            'category': [item.category for item in items],
+            'brand': [item.brand for item in items],
+            'size': [item.size for item in items],
+            'colors': [[color.model_dump() for color in item.colors] for item in items],
+            'description': [item.description for item in items],
+            'image_urls': [[str(url) for url in item.image_urls] for item in items],
+            'purchase_date': [item.purchase_date.timestamp() if item.purchase_date else None for item in items],
+            'purchase_price': [item.purchase_price for item in items],
+            'tags': [item.tags for item in items],
+            'is_favorite': [item.is_favorite for item in items],
+            'wear_count': [item.wear_count for item in items],
+            'last_worn': [item.last_worn.timestamp() if item.last_worn else None for item in items],
+            'condition': [item.condition for item in items],
+            'notes': [item.notes for item in items],
+            'created_at': [int(item.created_at.timestamp()) for item in items],
+            'updated_at': [int(item.updated_at.timestamp()) for item in items],
+        }
+        return orjson.dumps({'count': len(items), 'items': columns})
+
+    @classmethod
+    def batch_from_firestore_json(cls, payload: bytes) -> List['ClothingItem']:
+        """Reconstruct items from a batch_to_firestore_json payload
+
+        Uses model_construct to skip re-validation - the data was validated
+        when the items were first created.
+        """
+        data = orjson.loads(payload)
+        columns = data['items']
+        fields = list(columns.keys())
+        items = []
+        for values in zip(*(columns[field] for field in fields)):
+            row = dict(zip(fields, values))
+            if row.get('purchase_date'):
+                row['purchase_date'] = datetime.fromtimestamp(row['purchase_date'])
+            if row.get('last_worn'):
+                row['last_worn'] = datetime.fromtimestamp(row['last_worn'])
+            row['created_at'] = datetime.fromtimestamp(row['created_at'])
+            row['updated_at'] = datetime.fromtimestamp(row['updated_at'])
+            row['colors'] = [Color.model_construct(**color) for color in row['colors']]
+            items.append(cls.model_construct(**row))
+        return items
 
 
 class Outfit(BaseFirestoreModel):
@@ -154,23 +223,22 @@ class Outfit(BaseFirestoreModel):
     wear_count: int = Field(default=0, ge=0, description="Number of times worn")
     last_worn: Optional[datetime] = Field(None, description="Last time worn")
 
-    @validator('clothing_item_ids')
+    @field_validator('clothing_item_ids')
+    @classmethod
     def validate_clothing_items(cls, v):
-        if len(v) > 20:
-            raise ValueError('Maximum 20 items per outfit')
-        return v
+        return _validate_max_length(v, 20, 'Maximum 20 items per outfit')
 
-    @validator('tags')
+    @field_validator('tags')
+    @classmethod
     def validate_tags(cls, v):
-        if len(v) > 10:
-            raise ValueError('Maximum 10 tags allowed')
-        return v
+        return _validate_tags(v, 10)
 
-    def increment_wear_count(self):
+    def increment_wear_count(self, now: Optional[datetime] = None):
         """Increment wear count and update last worn date"""
+        now = now or datetime.now()
         self.wear_count += 1
-        self.last_worn = datetime.now()
-        self.update_timestamp()
+        self.last_worn = now
+        self.update_timestamp(now)
 
     def to_firestore(self) -> Dict[str, Any]:
         """Convert to Firestore document format"""
@@ -187,7 +255,7 @@ class Outfit(BaseFirestoreModel):
         return data
 
     @classmethod
-    def from_firestore(cls, doc_data: Dict[str, Any]) -> Optional['Outfit']:
+    def from_firestore(cls, doc_data: Dict[str, Any], trusted: bool = False) -> Optional['Outfit']:
         """Create instance from Firestore document"""
         if not doc_data:
             return None
@@ -196,7 +264,7 @@ class Outfit(BaseFirestoreModel):
         if 'last_worn' in doc_data and doc_data['last_worn']:
             doc_data['last_worn'] = datetime.fromtimestamp(doc_data['last_worn'])
 
-        return super().from_firestore(doc_data)
+        return super().from_firestore(doc_data, trusted=trusted)
 
 
 # API Models for requests/responses
@@ -232,8 +300,13 @@ class ClothingItemUpdate(BaseModel):
     notes: Optional[str] = Field(None, max_length=1000)
 
 
-class ClothingItemResponse(BaseModel):
-    """Model for clothing item API responses"""
+@dataclass(slots=True)
+class ClothingItemResponse:
+    """Model for clothing item API responses
+
+    Response-only model built from trusted internal data - a plain slots
+    dataclass skips pydantic validation on the hot read path.
+    """
     id: str
     user_uid: str
     name: str
@@ -278,8 +351,13 @@ class OutfitUpdate(BaseModel):
     is_favorite: Optional[bool] = None
 
 
-class OutfitResponse(BaseModel):
-    """Model for outfit API responses"""
+@dataclass(slots=True)
+class OutfitResponse:
+    """Model for outfit API responses
+
+    Response-only model built from trusted internal data - a plain slots
+    dataclass skips pydantic validation on the hot read path.
+    """
     id: str
     user_uid: str
     name: str
@@ -1,11 +1,20 @@
 import asyncio
+import binascii
+import functools
+import hashlib
+import io
 import logging
+import re
 import time
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Deque, List
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 import google.generativeai as genai
+import orjson
+import PIL.Image
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -13,6 +22,93 @@ from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Matches numbered ("1." / "2)") and bulleted ("-", "•", "*") suggestion lines
+_BULLET_RE = re.compile(r'^\s*(?:\d+[.)]|[-•*])\s+(.*\S)\s*$')
+
+# Cheap pre-check that a text part plausibly holds base64 image data
+_B64_RE = re.compile(r'^[A-Za-z0-9+/=\s]+$')
+
+
+# Memoized per-item description lines. The same outfit is commonly run
+# through try-on, compatibility and improvement back to back, each in its
+# own request with freshly parsed dicts - keying on the field values lets
+# every builder after the first reuse the formatted line.
+
+@functools.lru_cache(maxsize=512)
+def _try_on_item_line(name: str, category: str, brand: str, colors: tuple, size: str) -> str:
+    return f"- {name}: {category}, {brand}, {', '.join(colors)}, size {size}"
+
+
+@functools.lru_cache(maxsize=512)
+def _compatibility_item_line(name: str, category: str, colors: tuple, description: str) -> str:
+    return f"- {name}: {category}, {', '.join(colors)}, {description}"
+
+
+@functools.lru_cache(maxsize=512)
+def _improvement_item_line(name: str, category: str) -> str:
+    return f"- {name}: {category}"
+
+
+@functools.lru_cache(maxsize=512)
+def _image_item_desc(name: str, colors: tuple, category: str) -> str:
+    desc = name
+    if colors:
+        desc += f" in {', '.join(colors)}"
+    if category:
+        desc += f" ({category})"
+    return desc
+
+
+# Static prompt prefixes kept at module level so the large instruction
+# blocks come first and stay byte-identical across calls - provider-side
+# prefix caching only kicks in when the shared prefix precedes the
+# per-request dynamic content.
+
+TRY_ON_PROMPT_PREFIX = """You are a fashion stylist AI. Describe how the clothing items listed at the end would look together as an outfit, focusing on style, color coordination, and overall aesthetic.
+
+Provide a concise but detailed description of:
+1. How the colors and patterns work together
+2. The overall style and vibe of the outfit
+3. What occasions this outfit would be suitable for
+4. Any styling tips or considerations
+
+Keep the response engaging and helpful, around 100-150 words."""
+
+COMPATIBILITY_PROMPT_PREFIX = """Analyze the compatibility of the clothing items listed at the end as an outfit. Rate the compatibility on a scale of 1-10 and explain why.
+
+Please respond in the following JSON format:
+{
+    "compatibility_score": <1-10>,
+    "color_harmony": <1-10>,
+    "style_coherence": <1-10>,
+    "occasion_appropriateness": <1-10>,
+    "overall_assessment": "<brief explanation>",
+    "strengths": ["<strength1>", "<strength2>"],
+    "areas_for_improvement": ["<improvement1>", "<improvement2>"]
+}"""
+
+IMPROVEMENT_PROMPT_PREFIX = """Suggest 3-5 specific improvements for the outfit listed at the end.
+
+Provide practical suggestions such as:
+- Adding accessories
+- Changing colors or patterns
+- Adjusting fit or proportions
+- Substituting items for better coordination
+
+Format as a numbered list of specific, actionable suggestions."""
+
+IMAGE_GENERATION_PROMPT_PREFIX = """Generate a realistic photograph showing a person wearing the complete outfit described at the end.
+
+Requirements:
+- Show the person wearing ALL the specified clothing items together
+- Use realistic lighting and photography style
+- Display the outfit clearly and accurately
+- Show how the colors and pieces work together
+- Create a natural, appealing composition
+- Focus on how the complete outfit looks when worn
+
+Style: Professional fashion photography, natural lighting, clear details of the clothing items."""
+
 
 @dataclass
 class AIUsage:
@@ -28,51 +124,171 @@ class AIUsage:
 
 
 class RateLimiter:
-    """Simple rate limiter for AI API calls"""
+    """Token-bucket rate limiter for AI API calls
+
+    Keeps two buckets (requests and tokens) refilled continuously from a
+    monotonic clock, so admission decisions are constant-time arithmetic
+    instead of O(n) scans over per-request timestamp lists.
+    """
 
     def __init__(self, requests_per_minute: int, tokens_per_minute: int):
         self.requests_per_minute = requests_per_minute
         self.tokens_per_minute = tokens_per_minute
-        self.request_timestamps: List[datetime] = []
-        self.token_usage: List[tuple[datetime, int]] = []
+        self.request_capacity = float(requests_per_minute)
+        self.request_refill_per_sec = requests_per_minute / 60.0
+        self.token_capacity = float(tokens_per_minute)
+        self.token_refill_per_sec = tokens_per_minute / 60.0
+        self.request_tokens = self.request_capacity
+        self.token_tokens = self.token_capacity
+        self.last_refill = time.monotonic()
+
+    def _refill(self):
+        """Refill both buckets based on time elapsed since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.request_tokens = min(
+            self.request_capacity,
+            self.request_tokens + elapsed * self.request_refill_per_sec
+        )
+        self.token_tokens = min(
+            self.token_capacity,
+            self.token_tokens + elapsed * self.token_refill_per_sec
+        )
 
     def can_make_request(self, estimated_tokens: int = 100) -> bool:
         """Check if we can make a request within rate limits"""
-        now = datetime.now()
-        one_minute_ago = now - timedelta(minutes=1)
+        self._refill()
+        return self.request_tokens >= 1 and self.token_tokens >= estimated_tokens
 
-        # Clean old timestamps
-        self.request_timestamps = [ts for ts in self.request_timestamps if ts > one_minute_ago]
-        self.token_usage = [(ts, tokens) for ts, tokens in self.token_usage if ts > one_minute_ago]
+    def try_acquire(self, estimated_tokens: int = 100) -> bool:
+        """Refill, check and deduct in one step
 
-        # Check request rate limit
-        if len(self.request_timestamps) >= self.requests_per_minute:
+        Callers hold the service's rate-limit lock across this call so two
+        in-flight coroutines cannot both observe "under limit" and proceed.
+        """
+        self._refill()
+        if self.request_tokens < 1 or self.token_tokens < estimated_tokens:
             return False
-
-        # Check token rate limit
-        current_tokens = sum(tokens for _, tokens in self.token_usage)
-        if current_tokens + estimated_tokens > self.tokens_per_minute:
-            return False
-
+        self.request_tokens -= 1
+        self.token_tokens -= estimated_tokens
         return True
 
-    def record_request(self, tokens_used: int):
-        """Record a successful request"""
-        now = datetime.now()
-        self.request_timestamps.append(now)
-        self.token_usage.append((now, tokens_used))
+    def reconcile(self, estimated_tokens: int, actual_tokens: int):
+        """Adjust the token bucket once the real usage is known
+
+        Refunds over-estimates and deducts under-estimates, clamped to the
+        bucket bounds.
+        """
+        delta = estimated_tokens - actual_tokens
+        self.token_tokens = min(
+            self.token_capacity,
+            max(0.0, self.token_tokens + delta)
+        )
 
 
 class AIService:
     """Google Generative AI service for virtual try-on functionality"""
 
+    # Oldest hourly stats bucket kept for get_usage_stats (one week)
+    MAX_STATS_HOURS = 168
+
+    # Exact-match response cache bounds
+    RESPONSE_CACHE_MAX_ENTRIES = 256
+    RESPONSE_CACHE_TTL_SECONDS = 3600
+    # Only cache near-deterministic outputs; creative ones should stay fresh
+    RESPONSE_CACHE_MAX_TEMPERATURE = 0.3
+
     def __init__(self):
         self.settings = get_settings()
         self.client: Optional[genai.GenerativeModel] = None
         self.rate_limiter: Optional[RateLimiter] = None
-        self.usage_history: List[AIUsage] = []
+        # Bounded history so long-running workers keep a predictable footprint
+        self.usage_history: Deque[AIUsage] = deque(maxlen=self.settings.google_ai_usage_history_max)
+        # Incremental per-hour aggregates so get_usage_stats avoids full scans
+        self._hourly_buckets: Dict[int, Dict[str, float]] = {}
+        # LRU cache of text responses keyed by prompt hash (see _make_ai_request)
+        self._response_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Dedicated pool for blocking Gemini calls, isolated from the shared
+        # default executor and sized to the configured AI concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.settings.google_ai_max_concurrent,
+            thread_name_prefix="gemini"
+        )
+        # Serializes the rate limiter's check-then-deduct so concurrent
+        # coroutines cannot both pass the same remaining quota
+        self._rl_lock = asyncio.Lock()
         self._initialize_client()
 
+    def shutdown(self):
+        """Shut down the Gemini executor - called on application shutdown"""
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _canonical_cache_text(prompt: str) -> str:
+        """Normalize a prompt for cache-key purposes
+
+        Lowercases, collapses whitespace and sorts bullet lines so prompts
+        that only differ in item ordering or spacing ("summer casual" sets
+        listed in a different order) hit the same cache entry.
+        """
+        bullet_lines = []
+        other_lines = []
+        for line in prompt.lower().splitlines():
+            normalized = ' '.join(line.split())
+            if not normalized:
+                continue
+            if normalized.startswith('- '):
+                bullet_lines.append(normalized)
+            else:
+                other_lines.append(normalized)
+        return '\n'.join(other_lines + sorted(bullet_lines))
+
+    def _response_cache_enabled(self) -> bool:
+        """Whether text responses are deterministic enough to cache"""
+        return self.settings.google_ai_temperature < self.RESPONSE_CACHE_MAX_TEMPERATURE
+
+    def _response_cache_get(self, key: str) -> Optional[str]:
+        """Return a cached response if present and not expired"""
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+
+        cached_at, result = entry
+        if time.monotonic() - cached_at > self.RESPONSE_CACHE_TTL_SECONDS:
+            del self._response_cache[key]
+            return None
+
+        self._response_cache.move_to_end(key)
+        return result
+
+    def _response_cache_put(self, key: str, result: str):
+        """Store a response, evicting the least recently used entry if full"""
+        self._response_cache[key] = (time.monotonic(), result)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > self.RESPONSE_CACHE_MAX_ENTRIES:
+            self._response_cache.popitem(last=False)
+
+    def _record_usage(self, usage: AIUsage):
+        """Append a usage record and update the hourly aggregate counters"""
+        self.usage_history.append(usage)
+
+        bucket_key = int(time.time() // 3600)
+        bucket = self._hourly_buckets.get(bucket_key)
+        if bucket is None:
+            bucket = {"total": 0, "success": 0, "tokens": 0, "duration_sum": 0.0}
+            self._hourly_buckets[bucket_key] = bucket
+            # Evict buckets older than the largest supported window
+            cutoff = bucket_key - self.MAX_STATS_HOURS
+            for key in [k for k in self._hourly_buckets if k < cutoff]:
+                del self._hourly_buckets[key]
+
+        bucket["total"] += 1
+        if usage.success:
+            bucket["success"] += 1
+        bucket["tokens"] += usage.total_tokens
+        bucket["duration_sum"] += usage.request_duration
+
     def _initialize_client(self):
         """Initialize the Google Generative AI client"""
         if not self.settings.google_ai_api_key:
@@ -114,148 +330,149 @@ class AIService:
         """Check if AI service is available"""
         return self.client is not None
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
     async def _make_ai_request(self, prompt: str, image_data: Optional[bytes] = None) -> str:
-        """Make a request to the AI service with retry logic"""
+        """Make a request to the AI service with caching and retry logic"""
         if not self.is_available():
             raise RuntimeError("AI service is not available")
 
-        # Check rate limits
-        if not self.rate_limiter.can_make_request():
-            raise RuntimeError("Rate limit exceeded, please try again later")
+        # Serve repeated text prompts from cache - skips tokens and latency
+        cache_key = None
+        if image_data is None and self._response_cache_enabled():
+            cache_key = hashlib.sha256(
+                f"{self.settings.google_ai_model}:{self._canonical_cache_text(prompt)}".encode()
+            ).hexdigest()
+            cached = self._response_cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Decode the image once, outside the retry loop
+        if image_data:
+            content = [prompt, PIL.Image.open(io.BytesIO(image_data))]
+        else:
+            content = prompt
+
+        result = await self._request_text(prompt, content)
+        if cache_key is not None:
+            self._response_cache_put(cache_key, result)
+        return result
+
+    async def _invoke_gemini(self, prompt: str, content: Any, extract) -> Any:
+        """Shared Gemini request path for both text and image calls
+
+        Handles the rate-limit check, the executor dispatch and the usage
+        bookkeeping once; `extract` pulls the payload out of the raw
+        response and returns (result, completion_tokens), raising
+        RuntimeError when the response holds nothing usable.
+        """
+        # Cheap word-count proxy: one C-level scan, no intermediate list
+        prompt_tokens = prompt.count(' ') + 1 if prompt else 0
+
+        # Atomically check rate limits and deduct an estimate up front;
+        # the estimate is reconciled against actual usage in the finally
+        estimated_tokens = prompt_tokens + 100
+        async with self._rl_lock:
+            if not self.rate_limiter.try_acquire(estimated_tokens):
+                raise RuntimeError("Rate limit exceeded, please try again later")
 
         start_time = time.time()
         success = False
         error_message = None
+        completion_tokens = 0
         tokens_used = 0
 
         try:
-            # Prepare content
-            if image_data:
-                # For image + text prompts
-                import PIL.Image
-                import io
-                image = PIL.Image.open(io.BytesIO(image_data))
-                content = [prompt, image]
-            else:
-                # Text only
-                content = prompt
-
             # Make the request
             response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.generate_content(content)
+                self._executor, self.client.generate_content, content
             )
 
-            # Extract response text
-            if response.text:
-                result = response.text
-                success = True
-                # Estimate tokens (rough approximation)
-                tokens_used = len(prompt.split()) + len(result.split())
-                self.rate_limiter.record_request(tokens_used)
-                return result
-            else:
-                raise RuntimeError("Empty response from AI service")
+            result, completion_tokens = extract(response)
+            success = True
+            # Estimate tokens (rough approximation)
+            tokens_used = prompt_tokens + completion_tokens
+            return result
 
         except Exception as e:
             error_message = str(e)
             logger.error(f"AI request failed: {e}")
             raise
         finally:
+            # Settle the up-front estimate: on success against real usage,
+            # on failure keep only the prompt tokens charged
+            self.rate_limiter.reconcile(
+                estimated_tokens,
+                tokens_used if success else prompt_tokens
+            )
+
             # Record usage
             duration = time.time() - start_time
             usage = AIUsage(
                 timestamp=datetime.now(),
                 model=self.settings.google_ai_model,
-                prompt_tokens=len(prompt.split()) if prompt else 0,
-                completion_tokens=tokens_used,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
                 total_tokens=tokens_used,
                 request_duration=duration,
                 success=success,
                 error_message=error_message
             )
-            self.usage_history.append(usage)
+            self._record_usage(usage)
+
+    @staticmethod
+    def _extract_text(response) -> tuple:
+        """Pull the text payload out of a Gemini response"""
+        if response.text:
+            result = response.text
+            return result, result.count(' ') + 1
+        raise RuntimeError("Empty response from AI service")
+
+    @staticmethod
+    def _extract_image(response) -> tuple:
+        """Pull image bytes out of a Gemini response's parts"""
+        # Handle image response from nanobanana
+        if hasattr(response, 'parts') and response.parts:
+            for part in response.parts:
+                # Check if this part contains image data
+                if hasattr(part, 'inline_data') and part.inline_data:
+                    return part.inline_data.data, 0
+                elif hasattr(part, 'function_call'):
+                    # Handle function call responses if needed
+                    continue
+                elif hasattr(part, 'text') and part.text:
+                    # Sometimes image data might be in text as base64 -
+                    # skip parts that clearly aren't before decoding
+                    if len(part.text) % 4 != 0 or not _B64_RE.match(part.text[:64]):
+                        continue
+                    try:
+                        return binascii.a2b_base64(part.text), 0
+                    except (binascii.Error, ValueError):
+                        continue
+
+        # If we reach here, no image was found in response
+        raise RuntimeError("No image data found in AI response")
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+    async def _request_text(self, prompt: str, content: Any) -> str:
+        """Send prepared content to Gemini, expecting a text response"""
+        return await self._invoke_gemini(prompt, content, self._extract_text)
+
     async def _make_ai_image_request(self, prompt: str, user_image: Optional[bytes] = None) -> bytes:
         """Make a request to the AI service expecting an image response"""
         if not self.is_available():
             raise RuntimeError("AI service is not available")
 
-        # Check rate limits
-        if not self.rate_limiter.can_make_request():
-            raise RuntimeError("Rate limit exceeded, please try again later")
+        # Decode the user image once, outside the retry loop
+        if user_image:
+            content = [prompt, PIL.Image.open(io.BytesIO(user_image))]
+        else:
+            content = prompt
 
-        start_time = time.time()
-        success = False
-        error_message = None
-        tokens_used = 0
-
-        try:
-            # Prepare content for image generation
-            if user_image:
-                import PIL.Image
-                import io
-                image = PIL.Image.open(io.BytesIO(user_image))
-                content = [prompt, image]
-            else:
-                content = prompt
-
-            # Make the request for image generation
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.generate_content(content)
-            )
-
-            # Handle image response from nanobanana
-            if hasattr(response, 'parts') and response.parts:
-                for part in response.parts:
-                    # Check if this part contains image data
-                    if hasattr(part, 'inline_data') and part.inline_data:
-                        # Extract image bytes
-                        image_data = part.inline_data.data
-                        success = True
-                        tokens_used = len(prompt.split())
-                        self.rate_limiter.record_request(tokens_used)
-                        return image_data
-                    elif hasattr(part, 'function_call'):
-                        # Handle function call responses if needed
-                        continue
-                    elif hasattr(part, 'text') and part.text:
-                        # Sometimes image data might be in text as base64
-                        import base64
-                        try:
-                            # Try to decode as base64
-                            image_data = base64.b64decode(part.text)
-                            success = True
-                            tokens_used = len(prompt.split())
-                            self.rate_limiter.record_request(tokens_used)
-                            return image_data
-                        except:
-                            continue
-
-            # If we reach here, no image was found in response
-            raise RuntimeError("No image data found in AI response")
+        return await self._request_image(prompt, content)
 
-        except Exception as e:
-            error_message = str(e)
-            logger.error(f"AI image request failed: {e}")
-            raise
-        finally:
-            # Record usage
-            duration = time.time() - start_time
-            usage = AIUsage(
-                timestamp=datetime.now(),
-                model=self.settings.google_ai_model,
-                prompt_tokens=len(prompt.split()) if prompt else 0,
-                completion_tokens=0,  # Image generation doesn't have completion tokens
-                total_tokens=tokens_used,
-                request_duration=duration,
-                success=success,
-                error_message=error_message
-            )
-            self.usage_history.append(usage)
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+    async def _request_image(self, prompt: str, content: Any) -> bytes:
+        """Send prepared content to Gemini, expecting image bytes back"""
+        return await self._invoke_gemini(prompt, content, self._extract_image)
 
     async def generate_try_on_description(
         self,
@@ -314,12 +531,19 @@ class AIService:
         user_context: Optional[Dict[str, Any]] = None
     ) -> str:
         """Build prompt for try-on description"""
-        items_description = "\n".join([
-            f"- {item.get('name', 'Unknown item')}: {item.get('category', 'unknown category')}, "
-            f"{item.get('brand', 'no brand')}, {', '.join(item.get('colors', []))}, "
-            f"size {item.get('size', 'unknown')}"
-            for item in clothing_items
-        ])
+        # Build item lines with one append per item and a single join
+        parts = []
+        append = parts.append
+        for item in clothing_items:
+            get = item.get
+            append(_try_on_item_line(
+                get('name', 'Unknown item'),
+                get('category', 'unknown category'),
+                get('brand', 'no brand'),
+                tuple(get('colors', [])),
+                get('size', 'unknown')
+            ))
+        items_description = "\n".join(parts)
 
         context_info = ""
         if user_context:
@@ -330,43 +554,30 @@ class AIService:
             if weather:
                 context_info += f"\nWeather: {weather}"
 
-        return f"""You are a fashion stylist AI. Describe how the following clothing items would look together as an outfit, focusing on style, color coordination, and overall aesthetic.
+        return f"""{TRY_ON_PROMPT_PREFIX}
 
 Clothing items:
 {items_description}
-{context_info}
-
-Provide a concise but detailed description of:
-1. How the colors and patterns work together
-2. The overall style and vibe of the outfit
-3. What occasions this outfit would be suitable for
-4. Any styling tips or considerations
-
-Keep the response engaging and helpful, around 100-150 words."""
+{context_info}"""
 
     def _build_compatibility_prompt(self, clothing_items: List[Dict[str, Any]]) -> str:
         """Build prompt for compatibility analysis"""
-        items_description = "\n".join([
-            f"- {item.get('name', 'Unknown item')}: {item.get('category', 'unknown category')}, "
-            f"{', '.join(item.get('colors', []))}, {item.get('description', '')}"
-            for item in clothing_items
-        ])
+        parts = []
+        append = parts.append
+        for item in clothing_items:
+            get = item.get
+            append(_compatibility_item_line(
+                get('name', 'Unknown item'),
+                get('category', 'unknown category'),
+                tuple(get('colors', [])),
+                get('description', '')
+            ))
+        items_description = "\n".join(parts)
 
-        return f"""Analyze the compatibility of these clothing items as an outfit. Rate the compatibility on a scale of 1-10 and explain why.
+        return f"""{COMPATIBILITY_PROMPT_PREFIX}
 
 Clothing items:
-{items_description}
-
-Please respond in the following JSON format:
-{{
-    "compatibility_score": <1-10>,
-    "color_harmony": <1-10>,
-    "style_coherence": <1-10>,
-    "occasion_appropriateness": <1-10>,
-    "overall_assessment": "<brief explanation>",
-    "strengths": ["<strength1>", "<strength2>"],
-    "areas_for_improvement": ["<improvement1>", "<improvement2>"]
-}}"""
+{items_description}"""
 
     def _build_improvement_prompt(
         self,
@@ -375,10 +586,15 @@ Please respond in the following JSON format:
         weather: Optional[str] = None
     ) -> str:
         """Build prompt for outfit improvement suggestions"""
-        items_description = "\n".join([
-            f"- {item.get('name', 'Unknown item')}: {item.get('category', 'unknown category')}"
-            for item in clothing_items
-        ])
+        parts = []
+        append = parts.append
+        for item in clothing_items:
+            get = item.get
+            append(_improvement_item_line(
+                get('name', 'Unknown item'),
+                get('category', 'unknown category')
+            ))
+        items_description = "\n".join(parts)
 
         context = ""
         if occasion:
@@ -386,19 +602,11 @@ Please respond in the following JSON format:
         if weather:
             context += f"\nWeather: {weather}"
 
-        return f"""Suggest 3-5 specific improvements for this outfit:
+        return f"""{IMPROVEMENT_PROMPT_PREFIX}
 
 Current outfit:
 {items_description}
-{context}
-
-Provide practical suggestions such as:
-- Adding accessories
-- Changing colors or patterns
-- Adjusting fit or proportions
-- Substituting items for better coordination
-
-Format as a numbered list of specific, actionable suggestions."""
+{context}"""
 
     def _build_image_try_on_prompt(self, clothing_items: List[Dict[str, Any]]) -> str:
         """Build prompt for image-based try-on"""
@@ -421,13 +629,14 @@ Provide an encouraging and detailed description of how great they would look in
     ) -> str:
         """Build prompt for generating try-on image with nanobanana"""
         items_description = []
+        append = items_description.append
         for item in clothing_items:
-            desc = f"{item.get('name', 'clothing item')}"
-            if item.get('colors'):
-                desc += f" in {', '.join(item.get('colors', []))}"
-            if item.get('category'):
-                desc += f" ({item.get('category')})"
-            items_description.append(desc)
+            get = item.get
+            append(_image_item_desc(
+                get('name', 'clothing item'),
+                tuple(get('colors') or ()),
+                get('category') or ''
+            ))
 
         outfit_desc = ", ".join(items_description)
 
@@ -443,29 +652,26 @@ Provide an encouraging and detailed description of how great they would look in
             if style:
                 context_info += f" with {style} styling"
 
-        return f"""Generate a realistic photograph showing a person wearing this complete outfit: {outfit_desc}{context_info}.
+        return f"""{IMAGE_GENERATION_PROMPT_PREFIX}
 
-Requirements:
-- Show the person wearing ALL the specified clothing items together
-- Use realistic lighting and photography style
-- Display the outfit clearly and accurately
-- Show how the colors and pieces work together
-- Create a natural, appealing composition
-- Focus on how the complete outfit looks when worn
-
-Style: Professional fashion photography, natural lighting, clear details of the clothing items."""
+Outfit: {outfit_desc}{context_info}"""
 
     def _parse_compatibility_response(self, response: str) -> Dict[str, Any]:
         """Parse JSON response from compatibility analysis"""
         try:
-            import json
-            # Try to extract JSON from the response
+            # Extract the first balanced JSON object with a single forward scan
             start = response.find('{')
-            end = response.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
-        except Exception as e:
+            if start >= 0:
+                depth = 0
+                for index in range(start, len(response)):
+                    char = response[index]
+                    if char == '{':
+                        depth += 1
+                    elif char == '}':
+                        depth -= 1
+                        if depth == 0:
+                            return orjson.loads(response[start:index + 1])
+        except orjson.JSONDecodeError as e:
             logger.warning(f"Failed to parse compatibility response as JSON: {e}")
 
         # Fallback to structured text response
@@ -481,25 +687,36 @@ Style: Professional fashion photography, natural lighting, clear details of the
 
     def _parse_suggestions_response(self, response: str) -> List[str]:
         """Parse suggestions from AI response"""
-        lines = response.strip().split('\n')
-        suggestions = []
-
-        for line in lines:
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                # Remove numbering/bullets
-                suggestion = line.lstrip('0123456789.-• ')
-                if suggestion:
-                    suggestions.append(suggestion)
-
+        suggestions = [
+            match.group(1)
+            for match in map(_BULLET_RE.match, response.splitlines())
+            if match
+        ]
         return suggestions if suggestions else [response]
 
     def get_usage_stats(self, hours: int = 24) -> Dict[str, Any]:
-        """Get usage statistics for the specified time period"""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent_usage = [usage for usage in self.usage_history if usage.timestamp > cutoff]
-
-        if not recent_usage:
+        """Get usage statistics for the specified time period
+
+        Sums the pre-aggregated hourly buckets, so the cost scales with
+        the window size rather than the number of recorded requests.
+        """
+        current_bucket = int(time.time() // 3600)
+        oldest_bucket = current_bucket - hours + 1
+
+        total_requests = 0
+        successful_requests = 0
+        total_tokens = 0
+        total_duration = 0.0
+
+        for key in range(oldest_bucket, current_bucket + 1):
+            bucket = self._hourly_buckets.get(key)
+            if bucket:
+                total_requests += int(bucket["total"])
+                successful_requests += int(bucket["success"])
+                total_tokens += int(bucket["tokens"])
+                total_duration += bucket["duration_sum"]
+
+        if not total_requests:
             return {
                 "total_requests": 0,
                 "successful_requests": 0,
@@ -509,12 +726,9 @@ Style: Professional fashion photography, natural lighting, clear details of the
                 "error_rate": 0
             }
 
-        total_requests = len(recent_usage)
-        successful_requests = sum(1 for usage in recent_usage if usage.success)
         failed_requests = total_requests - successful_requests
-        total_tokens = sum(usage.total_tokens for usage in recent_usage)
-        average_duration = sum(usage.request_duration for usage in recent_usage) / total_requests
-        error_rate = failed_requests / total_requests if total_requests > 0 else 0
+        average_duration = total_duration / total_requests
+        error_rate = failed_requests / total_requests
 
         return {
             "total_requests": total_requests,
@@ -526,13 +740,18 @@ Style: Professional fashion photography, natural lighting, clear details of the
         }
 
 
-# Global AI service instance
-_ai_service: Optional[AIService] = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_ai_service() -> AIService:
-    """Get the global AI service instance"""
-    global _ai_service
-    if _ai_service is None:
-        _ai_service = AIService()
-    return _ai_service
\ No newline at end of file
+    """Get the global AI service instance
+
+    lru_cache makes the lazy initialization atomic in CPython, so the
+    first concurrent requests cannot race to build two clients. Tests can
+    reset the singleton with get_ai_service.cache_clear().
+    """
+    return AIService()
+
+def shutdown_ai_service():
+    """Shut down the global AI service if it was created"""
+    if get_ai_service.cache_info().currsize:
+        get_ai_service().shutdown()
+        get_ai_service.cache_clear()
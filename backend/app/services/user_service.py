@@ -1,15 +1,90 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import asyncio
+import io
 import logging
+import os
+import secrets
 from datetime import datetime
+from tempfile import SpooledTemporaryFile
 from fastapi import HTTPException, UploadFile
-import uuid
-
-from ..core.firebase import FirestoreHelper, get_storage_bucket
+from PIL import Image
+
+from cachetools import TTLCache
+from firebase_admin import firestore
+from google.api_core.exceptions import (
+    AlreadyExists,
+    DeadlineExceeded,
+    NotFound,
+    ServiceUnavailable,
+)
+
+from ..core.firebase import FirestoreHelper, get_firestore_client, get_storage_bucket
 from ..models.user import User, UserCreate, UserUpdate, UserResponse
 from ..models.profile import Profile, ProfileCreate, ProfileUpdate, ProfileResponse
 
 logger = logging.getLogger(__name__)
 
+# Read-through caches for the hot user/profile lookups. Docs are read far
+# more often than written (auth middleware, profile views), so a short TTL
+# sheds most Firestore reads; every mutator pops the affected entry.
+_user_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+_profile_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+
+# Fields an update payload may touch, precomputed once so the update path
+# needs no per-field hasattr probing
+_PROFILE_UPDATABLE = frozenset(ProfileUpdate.model_fields) & frozenset(Profile.model_fields)
+
+
+# Transient Firestore/Storage pressure is surfaced as a retryable 503
+# instead of an opaque 500; only genuinely unexpected errors pay for a
+# full traceback via logger.exception
+_SERVICE_UNAVAILABLE = HTTPException(
+    status_code=503,
+    detail="Service temporarily unavailable",
+    headers={"Retry-After": "1"}
+)
+
+
+def clear_caches():
+    """Drop all cached user/profile responses - used by tests"""
+    _user_cache.clear()
+    _profile_cache.clear()
+
+
+def _looks_like_image(head: bytes) -> bool:
+    """Cheap magic-number check for the supported image formats
+
+    The client-supplied content type is trivially spoofed; sniffing the
+    first bytes rejects junk uploads before any Storage round-trip.
+    """
+    return (
+        head[:3] == b'\xff\xd8\xff'                         # JPEG
+        or head[:8] == b'\x89PNG\r\n\x1a\n'                 # PNG
+        or (head[:4] == b'RIFF' and head[8:12] == b'WEBP')  # WebP
+        or head[:6] in (b'GIF87a', b'GIF89a')               # GIF
+    )
+
+
+def _encode_avatar(source) -> tuple:
+    """Re-encode an uploaded avatar as WebP plus a 300x300 thumbnail
+
+    Recompression cuts storage and transfer size substantially with
+    negligible quality loss; runs in a worker thread since the encode is
+    CPU-bound.
+    """
+    image = Image.open(source).convert("RGB")
+
+    main = image.copy()
+    main.thumbnail((1024, 1024), Image.LANCZOS)
+    main_buf = io.BytesIO()
+    main.save(main_buf, "WEBP", quality=80, method=6)
+
+    image.thumbnail((300, 300), Image.LANCZOS)
+    thumb_buf = io.BytesIO()
+    image.save(thumb_buf, "WEBP", quality=70, method=6)
+
+    return main_buf.getvalue(), thumb_buf.getvalue()
+
 class UserService:
     """Service layer for user management"""
 
@@ -20,11 +95,6 @@ class UserService:
     async def create_user(user_data: UserCreate) -> UserResponse:
         """Create a new user in Firestore"""
         try:
-            # Check if user already exists
-            existing_user = await UserService.get_user_by_uid(user_data.uid)
-            if existing_user:
-                raise HTTPException(status_code=409, detail="User already exists")
-
             # Create user object
             user = User(
                 uid=user_data.uid,
@@ -35,14 +105,17 @@ class UserService:
                 phone_number=user_data.phone_number
             )
 
-            # Save to Firestore
+            # Conditional create detects duplicates without a prior read
             user_doc = user.to_firestore()
-            success = FirestoreHelper.create_document(
+            success = await asyncio.to_thread(
+                FirestoreHelper.create_document_if_absent,
                 UserService.USERS_COLLECTION,
                 user.uid,
                 user_doc
             )
 
+            if success is None:
+                raise HTTPException(status_code=409, detail="User already exists")
             if not success:
                 raise HTTPException(status_code=500, detail="Failed to create user")
 
@@ -51,15 +124,26 @@ class UserService:
 
         except HTTPException:
             raise
-        except Exception as e:
-            logger.error(f"Error creating user: {str(e)}")
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Firestore unavailable creating user: {str(e)}")
+            raise _SERVICE_UNAVAILABLE
+        except AlreadyExists:
+            raise HTTPException(status_code=409, detail="User already exists")
+        except Exception:
+            logger.exception("Unexpected error creating user")
             raise HTTPException(status_code=500, detail="Internal server error")
 
     @staticmethod
     async def get_user_by_uid(uid: str) -> Optional[UserResponse]:
         """Get user by UID"""
+        cached = _user_cache.get(uid)
+        if cached is not None:
+            return cached
+
         try:
-            user_doc = FirestoreHelper.get_document(UserService.USERS_COLLECTION, uid)
+            user_doc = await asyncio.to_thread(
+                FirestoreHelper.get_document, UserService.USERS_COLLECTION, uid
+            )
             if not user_doc:
                 return None
 
@@ -67,72 +151,142 @@ class UserService:
             if not user:
                 return None
 
-            return UserResponse.from_user(user)
+            response = UserResponse.from_user(user)
+            _user_cache[uid] = response
+            return response
 
-        except Exception as e:
-            logger.error(f"Error getting user {uid}: {str(e)}")
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Firestore unavailable getting user {uid}: {str(e)}")
+            return None
+        except Exception:
+            logger.exception(f"Unexpected error getting user {uid}")
             return None
 
     @staticmethod
-    async def update_user(uid: str, user_update: UserUpdate) -> UserResponse:
-        """Update user information"""
-        try:
-            # Get existing user
-            existing_user_doc = FirestoreHelper.get_document(UserService.USERS_COLLECTION, uid)
-            if not existing_user_doc:
-                raise HTTPException(status_code=404, detail="User not found")
+    async def get_user_with_profile(uid: str) -> Tuple[Optional[UserResponse], Optional[ProfileResponse]]:
+        """Get a user and their profile in a single Firestore round-trip
 
-            # Create user object from existing data
-            user = User.from_firestore(existing_user_doc, uid)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
+        The profile-page load needs both documents; get_all fetches them
+        over one gRPC stream instead of two serial requests.
+        """
+        cached_user = _user_cache.get(uid)
+        cached_profile = _profile_cache.get(uid)
+        if cached_user is not None and cached_profile is not None:
+            return cached_user, cached_profile
 
-            # Update fields that are provided
-            update_data = user_update.model_dump(exclude_unset=True)
-            for field, value in update_data.items():
-                if hasattr(user, field) and value is not None:
-                    setattr(user, field, value)
+        try:
+            db = get_firestore_client()
+            if not db:
+                return None, None
+
+            user_ref = db.collection(UserService.USERS_COLLECTION).document(uid)
+            profile_ref = db.collection(UserService.PROFILES_COLLECTION).document(uid)
+            snapshots = await asyncio.to_thread(
+                lambda: list(db.get_all([user_ref, profile_ref]))
+            )
 
-            # Update timestamp
-            user.update_timestamp()
+            user_response = None
+            profile_response = None
+            for snapshot in snapshots:
+                if not snapshot.exists:
+                    continue
+                if snapshot.reference == user_ref:
+                    user = User.from_firestore(snapshot.to_dict(), uid)
+                    if user:
+                        user_response = UserResponse.from_user(user)
+                else:
+                    profile = Profile.from_firestore(snapshot.to_dict(), uid)
+                    if profile:
+                        profile_response = ProfileResponse.from_profile(profile)
+
+            if user_response is not None:
+                _user_cache[uid] = user_response
+            if profile_response is not None:
+                _profile_cache[uid] = profile_response
+
+            return user_response, profile_response
+
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Firestore unavailable getting user and profile for {uid}: {str(e)}")
+            return None, None
+        except Exception:
+            logger.exception(f"Unexpected error getting user and profile for {uid}")
+            return None, None
 
-            # Save to Firestore
-            user_doc = user.to_firestore()
-            success = FirestoreHelper.update_document(
+    @staticmethod
+    async def update_user(uid: str, user_update: UserUpdate) -> UserResponse:
+        """Update user information"""
+        try:
+            # Send only the changed fields - no prior read round-trip
+            update_data = user_update.model_dump(exclude_unset=True, exclude_none=True)
+            if not update_data:
+                user_response = await UserService.get_user_by_uid(uid)
+                if not user_response:
+                    raise HTTPException(status_code=404, detail="User not found")
+                return user_response
+
+            update_data["updated_at"] = firestore.SERVER_TIMESTAMP
+            success = await asyncio.to_thread(
+                FirestoreHelper.update_document,
                 UserService.USERS_COLLECTION,
                 uid,
-                user_doc
+                update_data
             )
 
             if not success:
+                # Distinguish a missing doc from a transient write failure
+                if not await asyncio.to_thread(
+                    FirestoreHelper.get_document, UserService.USERS_COLLECTION, uid
+                ):
+                    raise HTTPException(status_code=404, detail="User not found")
                 raise HTTPException(status_code=500, detail="Failed to update user")
 
+            _user_cache.pop(uid, None)
             logger.info(f"User updated successfully: {uid}")
-            return UserResponse.from_user(user)
+
+            # One follow-up read returns the full updated object
+            user_response = await UserService.get_user_by_uid(uid)
+            if not user_response:
+                raise HTTPException(status_code=404, detail="User not found")
+            return user_response
 
         except HTTPException:
             raise
-        except Exception as e:
-            logger.error(f"Error updating user {uid}: {str(e)}")
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Firestore unavailable updating user {uid}: {str(e)}")
+            raise _SERVICE_UNAVAILABLE
+        except NotFound:
+            raise HTTPException(status_code=404, detail="User not found")
+        except Exception:
+            logger.exception(f"Unexpected error updating user {uid}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
     @staticmethod
     async def delete_user(uid: str) -> bool:
-        """Delete user and associated profile"""
+        """Delete user and associated profile atomically"""
         try:
-            # Delete user profile first
-            FirestoreHelper.delete_document(UserService.PROFILES_COLLECTION, uid)
-
-            # Delete user
-            success = FirestoreHelper.delete_document(UserService.USERS_COLLECTION, uid)
-
-            if success:
-                logger.info(f"User deleted successfully: {uid}")
-
-            return success
-
-        except Exception as e:
-            logger.error(f"Error deleting user {uid}: {str(e)}")
+            db = get_firestore_client()
+            batch = FirestoreHelper.batch()
+            if not db or not batch:
+                return False
+
+            # One batch commit deletes both documents in a single round-trip
+            # and closes the window where the profile is gone but the user
+            # document remains
+            batch.delete(db.collection(UserService.PROFILES_COLLECTION).document(uid))
+            batch.delete(db.collection(UserService.USERS_COLLECTION).document(uid))
+            await asyncio.to_thread(batch.commit)
+
+            _user_cache.pop(uid, None)
+            _profile_cache.pop(uid, None)
+            logger.info(f"User deleted successfully: {uid}")
+            return True
+
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Firestore unavailable deleting user {uid}: {str(e)}")
+            return False
+        except Exception:
+            logger.exception(f"Unexpected error deleting user {uid}")
             return False
 
     @staticmethod
@@ -143,58 +297,142 @@ class UserService:
             if not file.content_type or not file.content_type.startswith('image/'):
                 raise HTTPException(status_code=400, detail="File must be an image")
 
-            # Validate file size (max 5MB)
-            file_content = await file.read()
-            if len(file_content) > 5 * 1024 * 1024:
-                raise HTTPException(status_code=400, detail="File size must be less than 5MB")
-
             # Get storage bucket
             bucket = get_storage_bucket()
             if not bucket:
                 raise HTTPException(status_code=500, detail="Storage not available")
 
-            # Generate unique filename
-            file_extension = file.filename.split('.')[-1] if file.filename and '.' in file.filename else 'jpg'
-            filename = f"profile_pictures/{uid}_{uuid.uuid4().hex}.{file_extension}"
-
-            # Upload to Firebase Storage
-            blob = bucket.blob(filename)
-            blob.upload_from_string(file_content, content_type=file.content_type)
-
-            # Make the file publicly accessible
-            blob.make_public()
-
-            # Get public URL
-            public_url = blob.public_url
-
-            # Update user document with new profile picture URL
-            user_doc = FirestoreHelper.get_document(UserService.USERS_COLLECTION, uid)
-            if user_doc:
-                user = User.from_firestore(user_doc, uid)
-                if user:
-                    user.profile_picture_url = public_url
-                    user.update_timestamp()
-                    FirestoreHelper.update_document(
-                        UserService.USERS_COLLECTION,
-                        uid,
-                        user.to_firestore()
+            # Generate unique filename; reject unknown extensions before
+            # anything is uploaded
+            file_extension = os.path.splitext(file.filename or "")[1].lstrip('.').lower() or 'jpg'
+            if file_extension not in {"jpg", "jpeg", "png", "webp", "gif"}:
+                raise HTTPException(status_code=400, detail="Unsupported image format")
+
+            upload_token = secrets.token_hex(8)
+            filename = f"profile_pictures/{uid}_{upload_token}.{file_extension}"
+
+            thumbnail_url = None
+            thumbnail_path = None
+
+            # Stream the upload through a spooled temp file, enforcing the
+            # 5MB cap incrementally - at most 1MB is buffered in memory and
+            # oversize uploads fail before the tail is read
+            with SpooledTemporaryFile(max_size=1024 * 1024) as spooled:
+                total_size = 0
+                while chunk := await file.read(64 * 1024):
+                    # Sniff the magic bytes of the first chunk before
+                    # reading (or storing) anything else
+                    if total_size == 0 and not _looks_like_image(chunk[:12]):
+                        raise HTTPException(status_code=400, detail="File must be an image")
+                    total_size += len(chunk)
+                    if total_size > 5 * 1024 * 1024:
+                        raise HTTPException(status_code=400, detail="File size must be less than 5MB")
+                    spooled.write(chunk)
+
+                # Recompress off the event loop; WebP re-encode cuts the
+                # stored and transferred bytes for every later avatar GET
+                spooled.seek(0)
+                try:
+                    main_bytes, thumb_bytes = await asyncio.to_thread(_encode_avatar, spooled)
+                except Exception as e:
+                    logger.warning(f"Could not re-encode avatar for user {uid}: {str(e)}")
+                    main_bytes = thumb_bytes = None
+
+                if main_bytes is not None:
+                    filename = f"profile_pictures/{uid}_{upload_token}.webp"
+                    thumbnail_path = f"profile_pictures/{uid}_{upload_token}_thumb.webp"
+                    blob = bucket.blob(filename)
+                    thumb_blob = bucket.blob(thumbnail_path)
+
+                    # The two blob uploads are independent - ship them in
+                    # parallel off the event loop
+                    await asyncio.gather(
+                        asyncio.to_thread(
+                            blob.upload_from_string, main_bytes, content_type="image/webp"
+                        ),
+                        asyncio.to_thread(
+                            thumb_blob.upload_from_string, thumb_bytes, content_type="image/webp"
+                        )
+                    )
+                    thumbnail_url = (
+                        f"https://storage.googleapis.com/{bucket.name}/{thumbnail_path}"
+                    )
+                else:
+                    # Store the original bytes verbatim if Pillow can't
+                    # decode the upload
+                    spooled.seek(0)
+                    blob = bucket.blob(filename)
+                    await asyncio.to_thread(
+                        blob.upload_from_file, spooled,
+                        content_type=file.content_type, size=total_size
                     )
 
+            # Read access comes from a bucket-level IAM binding on the
+            # profile_pictures/ prefix set at deploy time, so the public
+            # URL can be built locally - no per-upload make_public() IAM
+            # round-trip
+            public_url = f"https://storage.googleapis.com/{bucket.name}/{filename}"
+
+            # Update user document with the new profile picture URL in a
+            # single merge write - no prior read round-trip needed
+            db = get_firestore_client()
+            batch = FirestoreHelper.batch()
+            if db and batch:
+                # Persist the object paths so removal never has to parse
+                # them back out of the public URLs
+                picture_fields = {
+                    "profile_picture_url": public_url,
+                    "profile_picture_path": filename,
+                    "updated_at": firestore.SERVER_TIMESTAMP
+                }
+                if thumbnail_url:
+                    picture_fields["profile_picture_thumbnail_url"] = thumbnail_url
+                    picture_fields["profile_picture_thumbnail_path"] = thumbnail_path
+                batch.set(
+                    db.collection(UserService.USERS_COLLECTION).document(uid),
+                    picture_fields,
+                    merge=True
+                )
+                await asyncio.to_thread(batch.commit)
+
+            _user_cache.pop(uid, None)
             logger.info(f"Profile picture uploaded successfully for user: {uid}")
             return public_url
 
         except HTTPException:
             raise
-        except Exception as e:
-            logger.error(f"Error uploading profile picture for user {uid}: {str(e)}")
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Storage unavailable uploading profile picture for user {uid}: {str(e)}")
+            raise _SERVICE_UNAVAILABLE
+        except Exception:
+            logger.exception(f"Unexpected error uploading profile picture for user {uid}")
             raise HTTPException(status_code=500, detail="Failed to upload profile picture")
 
+    @staticmethod
+    def _delete_blob(object_path: str):
+        """Delete a Storage object by its path
+
+        Deleting is idempotent - skip the exists() round-trip and just
+        swallow the 404 if the object is already gone.
+        """
+        try:
+            bucket = get_storage_bucket()
+            if bucket:
+                try:
+                    bucket.blob(object_path).delete()
+                except NotFound:
+                    pass
+        except Exception as e:
+            logger.warning(f"Could not delete file from storage: {str(e)}")
+
     @staticmethod
     async def remove_profile_picture(uid: str) -> bool:
         """Remove profile picture"""
         try:
             # Get user to check current profile picture
-            user_doc = FirestoreHelper.get_document(UserService.USERS_COLLECTION, uid)
+            user_doc = await asyncio.to_thread(
+                FirestoreHelper.get_document, UserService.USERS_COLLECTION, uid
+            )
             if not user_doc:
                 raise HTTPException(status_code=404, detail="User not found")
 
@@ -202,43 +440,55 @@ class UserService:
             if not user:
                 raise HTTPException(status_code=404, detail="User not found")
 
-            # Remove from storage if exists
-            if user.profile_picture_url:
-                try:
-                    bucket = get_storage_bucket()
-                    if bucket:
-                        # Extract filename from URL
-                        filename = user.profile_picture_url.split('/')[-1]
-                        if filename.startswith('profile_pictures%2F'):
-                            # URL decode the filename
-                            import urllib.parse
-                            filename = urllib.parse.unquote(filename)
-
-                        blob = bucket.blob(f"profile_pictures/{filename}")
-                        if blob.exists():
-                            blob.delete()
-                except Exception as e:
-                    logger.warning(f"Could not delete file from storage: {str(e)}")
-
-            # Update user document
-            user.profile_picture_url = None
-            user.update_timestamp()
-
-            success = FirestoreHelper.update_document(
+            # The stored object paths make Storage cleanup a direct delete -
+            # no URL parsing needed
+            object_paths = [
+                path for path in (user.profile_picture_path, user.profile_picture_thumbnail_path)
+                if path
+            ]
+
+            # Nothing stored - skip the write entirely
+            if not user.profile_picture_url and not object_paths:
+                return True
+
+            # Drop just the picture fields instead of rewriting the whole
+            # document. The Storage deletes and the Firestore update are
+            # independent - run the blocking calls in parallel off the
+            # event loop
+            update_call = asyncio.to_thread(
+                FirestoreHelper.update_document,
                 UserService.USERS_COLLECTION,
                 uid,
-                user.to_firestore()
+                {
+                    "profile_picture_url": firestore.DELETE_FIELD,
+                    "profile_picture_path": firestore.DELETE_FIELD,
+                    "profile_picture_thumbnail_url": firestore.DELETE_FIELD,
+                    "profile_picture_thumbnail_path": firestore.DELETE_FIELD,
+                    "updated_at": firestore.SERVER_TIMESTAMP
+                }
             )
+            if object_paths:
+                results = await asyncio.gather(
+                    *(asyncio.to_thread(UserService._delete_blob, path) for path in object_paths),
+                    update_call
+                )
+                success = results[-1]
+            else:
+                success = await update_call
 
             if success:
+                _user_cache.pop(uid, None)
                 logger.info(f"Profile picture removed successfully for user: {uid}")
 
             return success
 
         except HTTPException:
             raise
-        except Exception as e:
-            logger.error(f"Error removing profile picture for user {uid}: {str(e)}")
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Storage unavailable removing profile picture for user {uid}: {str(e)}")
+            raise _SERVICE_UNAVAILABLE
+        except Exception:
+            logger.exception(f"Unexpected error removing profile picture for user {uid}")
             raise HTTPException(status_code=500, detail="Failed to remove profile picture")
 
 class ProfileService:
@@ -250,11 +500,6 @@ class ProfileService:
     async def create_profile(profile_data: ProfileCreate) -> ProfileResponse:
         """Create a new profile"""
         try:
-            # Check if profile already exists
-            existing_profile = await ProfileService.get_profile_by_user_uid(profile_data.user_uid)
-            if existing_profile:
-                raise HTTPException(status_code=409, detail="Profile already exists for this user")
-
             # Create profile object
             profile = Profile(
                 user_uid=profile_data.user_uid,
@@ -265,14 +510,17 @@ class ProfileService:
             # Calculate initial completion percentage
             profile.calculate_completion_percentage()
 
-            # Save to Firestore
+            # Conditional create detects duplicates without a prior read
             profile_doc = profile.to_firestore()
-            success = FirestoreHelper.create_document(
+            success = await asyncio.to_thread(
+                FirestoreHelper.create_document_if_absent,
                 ProfileService.PROFILES_COLLECTION,
                 profile.user_uid,
                 profile_doc
             )
 
+            if success is None:
+                raise HTTPException(status_code=409, detail="Profile already exists for this user")
             if not success:
                 raise HTTPException(status_code=500, detail="Failed to create profile")
 
@@ -281,15 +529,26 @@ class ProfileService:
 
         except HTTPException:
             raise
-        except Exception as e:
-            logger.error(f"Error creating profile: {str(e)}")
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Firestore unavailable creating profile: {str(e)}")
+            raise _SERVICE_UNAVAILABLE
+        except AlreadyExists:
+            raise HTTPException(status_code=409, detail="Profile already exists for this user")
+        except Exception:
+            logger.exception("Unexpected error creating profile")
             raise HTTPException(status_code=500, detail="Internal server error")
 
     @staticmethod
     async def get_profile_by_user_uid(user_uid: str) -> Optional[ProfileResponse]:
         """Get profile by user UID"""
+        cached = _profile_cache.get(user_uid)
+        if cached is not None:
+            return cached
+
         try:
-            profile_doc = FirestoreHelper.get_document(ProfileService.PROFILES_COLLECTION, user_uid)
+            profile_doc = await asyncio.to_thread(
+                FirestoreHelper.get_document, ProfileService.PROFILES_COLLECTION, user_uid
+            )
             if not profile_doc:
                 return None
 
@@ -297,10 +556,15 @@ class ProfileService:
             if not profile:
                 return None
 
-            return ProfileResponse.from_profile(profile)
+            response = ProfileResponse.from_profile(profile)
+            _profile_cache[user_uid] = response
+            return response
 
-        except Exception as e:
-            logger.error(f"Error getting profile for user {user_uid}: {str(e)}")
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Firestore unavailable getting profile for user {user_uid}: {str(e)}")
+            return None
+        except Exception:
+            logger.exception(f"Unexpected error getting profile for user {user_uid}")
             return None
 
     @staticmethod
@@ -308,7 +572,9 @@ class ProfileService:
         """Update profile information"""
         try:
             # Get existing profile
-            existing_profile_doc = FirestoreHelper.get_document(ProfileService.PROFILES_COLLECTION, user_uid)
+            existing_profile_doc = await asyncio.to_thread(
+                FirestoreHelper.get_document, ProfileService.PROFILES_COLLECTION, user_uid
+            )
             if not existing_profile_doc:
                 raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -317,46 +583,66 @@ class ProfileService:
             if not profile:
                 raise HTTPException(status_code=404, detail="Profile not found")
 
-            # Update fields that are provided
+            # Apply the provided fields against the precomputed whitelist
             update_data = profile_update.model_dump(exclude_unset=True)
-            for field, value in update_data.items():
-                if hasattr(profile, field) and value is not None:
-                    setattr(profile, field, value)
+            profile.__dict__.update({
+                field: value for field, value in update_data.items()
+                if field in _PROFILE_UPDATABLE and value is not None
+            })
 
             # Recalculate completion percentage
             profile.update_profile_completion()
 
-            # Save to Firestore
-            profile_doc = profile.to_firestore()
-            success = FirestoreHelper.update_document(
+            # The dumped delta is already Firestore-ready - send it plus the
+            # recalculated metadata without re-serializing the whole document
+            payload = {
+                field: value for field, value in update_data.items()
+                if field in _PROFILE_UPDATABLE and value is not None
+            }
+            payload["profile_completion_percentage"] = profile.profile_completion_percentage
+            payload["updated_at"] = profile.updated_at
+            success = await asyncio.to_thread(
+                FirestoreHelper.update_document,
                 ProfileService.PROFILES_COLLECTION,
                 user_uid,
-                profile_doc
+                payload
             )
 
             if not success:
                 raise HTTPException(status_code=500, detail="Failed to update profile")
 
+            _profile_cache.pop(user_uid, None)
             logger.info(f"Profile updated successfully for user: {user_uid}")
             return ProfileResponse.from_profile(profile)
 
         except HTTPException:
             raise
-        except Exception as e:
-            logger.error(f"Error updating profile for user {user_uid}: {str(e)}")
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Firestore unavailable updating profile for user {user_uid}: {str(e)}")
+            raise _SERVICE_UNAVAILABLE
+        except NotFound:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        except Exception:
+            logger.exception(f"Unexpected error updating profile for user {user_uid}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
     @staticmethod
     async def delete_profile(user_uid: str) -> bool:
         """Delete profile"""
         try:
-            success = FirestoreHelper.delete_document(ProfileService.PROFILES_COLLECTION, user_uid)
+            success = await asyncio.to_thread(
+                FirestoreHelper.delete_document, ProfileService.PROFILES_COLLECTION, user_uid
+            )
 
             if success:
+                _profile_cache.pop(user_uid, None)
                 logger.info(f"Profile deleted successfully for user: {user_uid}")
 
             return success
 
-        except Exception as e:
-            logger.error(f"Error deleting profile for user {user_uid}: {str(e)}")
+        except (DeadlineExceeded, ServiceUnavailable) as e:
+            logger.error(f"Firestore unavailable deleting profile for user {user_uid}: {str(e)}")
+            return False
+        except Exception:
+            logger.exception(f"Unexpected error deleting profile for user {user_uid}")
             return False
\ No newline at end of file
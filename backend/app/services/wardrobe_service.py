@@ -1,12 +1,16 @@
 from typing import List, Optional, Dict, Any
-from uuid import uuid4
+from datetime import datetime
 from fastapi import HTTPException, UploadFile, status
+import asyncio
+import heapq
 import logging
+import orjson
 from collections import defaultdict
 from PIL import Image
 import io
 
 from ..core.firebase import FirestoreHelper, get_storage_bucket
+from ..utils.ids import new_id
 from ..models.wardrobe import (
     ClothingItem, ClothingItemCreate, ClothingItemUpdate, ClothingItemResponse,
     Outfit, OutfitCreate, OutfitUpdate, OutfitResponse,
@@ -16,19 +20,87 @@ from ..models.wardrobe import (
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj):
+    """orjson fallback for nested pydantic models (e.g. Color) in responses"""
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    return str(obj)
+
+
+def encode_responses(payload) -> bytes:
+    """Encode response dataclasses straight to JSON bytes with orjson
+
+    For trusted outbound data this skips FastAPI's jsonable_encoder and
+    response-model validation pass; orjson serializes the dataclasses,
+    datetimes and enums natively.
+    """
+    return orjson.dumps(payload, default=_json_default)
+
+
+# Formats we accept for wardrobe images, mapped to the MIME type the
+# stored object is served with
+_IMAGE_MIME_BY_FORMAT = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "GIF": "image/gif",
+    "WEBP": "image/webp",
+}
+
+
+def _sniff_image(fileobj):
+    """Identify an uploaded image by its actual bytes
+
+    The declared Content-Type header is client-controlled, so the real
+    format is read from the file itself. PIL only parses the header to
+    identify format and dimensions - no full decode - and the spooled
+    upload file is rewound afterwards so it can still be streamed to
+    storage. Raises ValueError for non-images or formats we don't
+    accept. Blocking; call via asyncio.to_thread.
+    """
+    try:
+        with Image.open(fileobj) as img:
+            mime = _IMAGE_MIME_BY_FORMAT.get(img.format)
+            width, height = img.size
+    except Exception:
+        raise ValueError("File content is not a valid image")
+    finally:
+        fileobj.seek(0)
+
+    if not mime:
+        raise ValueError("Unsupported image format")
+
+    return mime, width, height
+
+
 def _convert_clothing_item_to_response(clothing_item: ClothingItem) -> ClothingItemResponse:
-    """Convert ClothingItem to ClothingItemResponse with proper URL conversion"""
-    item_data = clothing_item.model_dump()
-    if item_data.get('image_urls'):
-        item_data['image_urls'] = [str(url) for url in clothing_item.image_urls]
+    """Convert ClothingItem to ClothingItemResponse with proper URL conversion
+
+    The item was already validated when it was created or read, so the
+    response dataclass is filled straight from the item's own field
+    values - no recursive model_dump pass per item, and no intermediate
+    dict copy unless URL objects need stringifying.
+    """
+    item_data = clothing_item.__dict__
+    urls = item_data.get('image_urls')
+    if urls and not isinstance(urls[0], str):
+        # Only validated items carry HttpUrl objects; trusted reads via
+        # model_construct keep the stored strings, so nothing to cast
+        item_data = dict(item_data)
+        item_data['image_urls'] = [str(url) for url in urls]
     return ClothingItemResponse(**item_data)
 
 
 def _convert_outfit_to_response(outfit: Outfit) -> OutfitResponse:
-    """Convert Outfit to OutfitResponse with proper URL conversion"""
-    outfit_data = outfit.model_dump()
-    if outfit_data.get('image_url'):
-        outfit_data['image_url'] = str(outfit.image_url)
+    """Convert Outfit to OutfitResponse with proper URL conversion
+
+    Same direct mapping as the clothing item converter - no copy at all
+    unless the URL object needs stringifying.
+    """
+    outfit_data = outfit.__dict__
+    image_url = outfit_data.get('image_url')
+    if image_url and not isinstance(image_url, str):
+        outfit_data = dict(outfit_data)
+        outfit_data['image_url'] = str(image_url)
     return OutfitResponse(**outfit_data)
 
 
@@ -39,7 +111,7 @@ class ClothingItemService:
     async def create_clothing_item(user_uid: str, item_data: ClothingItemCreate) -> ClothingItemResponse:
         """Create a new clothing item"""
         try:
-            item_id = str(uuid4())
+            item_id = new_id()
 
             # Create clothing item with generated ID
             clothing_item = ClothingItem(
@@ -49,7 +121,7 @@ class ClothingItemService:
             )
 
             # Save to Firestore
-            success = FirestoreHelper.create_document(
+            success = await asyncio.to_thread(FirestoreHelper.create_document,
                 "clothing_items",
                 item_id,
                 clothing_item.to_firestore()
@@ -77,11 +149,11 @@ class ClothingItemService:
     async def get_clothing_item(user_uid: str, item_id: str) -> Optional[ClothingItemResponse]:
         """Get a clothing item by ID"""
         try:
-            doc_data = FirestoreHelper.get_document("clothing_items", item_id)
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "clothing_items", item_id)
             if not doc_data:
                 return None
 
-            clothing_item = ClothingItem.from_firestore(doc_data)
+            clothing_item = ClothingItem.from_firestore(doc_data, trusted=True)
             if not clothing_item:
                 return None
 
@@ -100,50 +172,6 @@ class ClothingItemService:
             logger.error(f"Error getting clothing item {item_id}: {str(e)}")
             return None
 
-    @staticmethod
-    async def get_user_clothing_items(
-        user_uid: str,
-        category: Optional[ClothingCategory] = None,
-        is_favorite: Optional[bool] = None,
-        limit: int = 100,
-        offset: int = 0
-    ) -> List[ClothingItemResponse]:
-        """Get all clothing items for a user with optional filtering"""
-        try:
-            # Build query filters
-            filters = [("user_uid", "==", user_uid)]
-
-            if category:
-                filters.append(("category", "==", category.value))
-
-            if is_favorite is not None:
-                filters.append(("is_favorite", "==", is_favorite))
-
-            # Get documents with filters
-            docs = FirestoreHelper.query_documents(
-                "clothing_items",
-                filters=filters,
-                order_by=[("created_at", "desc")],
-                limit=limit,
-                offset=offset
-            )
-
-            items = []
-            for doc_data in docs:
-                clothing_item = ClothingItem.from_firestore(doc_data)
-                if clothing_item:
-                    items.append(_convert_clothing_item_to_response(clothing_item))
-
-            logger.info(f"Retrieved {len(items)} clothing items for user {user_uid}")
-            return items
-
-        except Exception as e:
-            logger.error(f"Error getting clothing items for user {user_uid}: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to retrieve clothing items"
-            )
-
     @staticmethod
     async def update_clothing_item(
         user_uid: str,
@@ -152,53 +180,43 @@ class ClothingItemService:
     ) -> Optional[ClothingItemResponse]:
         """Update a clothing item"""
         try:
-            # Get existing item
-            doc_data = FirestoreHelper.get_document("clothing_items", item_id)
-            if not doc_data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Clothing item not found"
-                )
-
-            clothing_item = ClothingItem.from_firestore(doc_data)
-            if not clothing_item:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Clothing item not found"
-                )
-
-            # Verify ownership
-            if clothing_item.user_uid != user_uid:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Access denied to this clothing item"
-                )
-
-            # Update fields
             update_data = item_update.model_dump(exclude_unset=True)
-            for field, value in update_data.items():
-                setattr(clothing_item, field, value)
-
-            clothing_item.update_timestamp()
-
-            # Save to Firestore
-            success = FirestoreHelper.update_document(
-                "clothing_items",
-                item_id,
-                clothing_item.to_firestore()
+            updated = {}
+
+            def _apply_update(doc_data):
+                clothing_item = ClothingItem.from_firestore(doc_data, trusted=True)
+                for field, value in update_data.items():
+                    setattr(clothing_item, field, value)
+                clothing_item.update_timestamp()
+                updated["item"] = clothing_item
+                # Send only the changed fields, already Firestore-encoded
+                encoded = clothing_item.to_firestore()
+                delta = {field: encoded[field] for field in update_data}
+                delta["updated_at"] = encoded["updated_at"]
+                return delta
+
+            # Ownership check and write run in one transaction - no
+            # separate read round-trip before the mutation
+            stored = await asyncio.to_thread(FirestoreHelper.update_owned_document,
+                "clothing_items", item_id, "user_uid", user_uid, _apply_update
             )
 
-            if not success:
+            if stored is None:
                 raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to update clothing item"
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Clothing item not found"
                 )
 
             logger.info(f"Updated clothing item {item_id} for user {user_uid}")
-            return _convert_clothing_item_to_response(clothing_item)
+            return _convert_clothing_item_to_response(updated["item"])
 
         except HTTPException:
             raise
+        except PermissionError:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to this clothing item"
+            )
         except Exception as e:
             logger.error(f"Error updating clothing item {item_id}: {str(e)}")
             raise HTTPException(
@@ -210,23 +228,8 @@ class ClothingItemService:
     async def delete_clothing_item(user_uid: str, item_id: str) -> bool:
         """Delete a clothing item"""
         try:
-            # Get existing item to verify ownership
-            doc_data = FirestoreHelper.get_document("clothing_items", item_id)
-            if not doc_data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Clothing item not found"
-                )
-
-            clothing_item = ClothingItem.from_firestore(doc_data)
-            if not clothing_item or clothing_item.user_uid != user_uid:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Access denied to this clothing item"
-                )
-
             # Check if item is used in any outfits
-            outfits_using_item = FirestoreHelper.query_documents(
+            outfits_using_item = await asyncio.to_thread(FirestoreHelper.query_documents,
                 "outfits",
                 filters=[
                     ("user_uid", "==", user_uid),
@@ -245,20 +248,94 @@ class ClothingItemService:
                     detail=f"Cannot delete item - it is used in {len(outfits_using_item)} outfit(s): {outfit_list}. Please remove it from these outfits first."
                 )
 
-            # Delete from Firestore
-            success = FirestoreHelper.delete_document("clothing_items", item_id)
+            # Ownership check and delete run in one transaction - no
+            # separate read round-trip before the mutation
+            deleted = await asyncio.to_thread(FirestoreHelper.delete_owned_document,
+                "clothing_items", item_id, "user_uid", user_uid
+            )
 
-            if success:
+            if deleted is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Clothing item not found"
+                )
+
+            if deleted:
                 logger.info(f"Deleted clothing item {item_id} for user {user_uid}")
 
-            return success
+            return bool(deleted)
 
         except HTTPException:
             raise
+        except PermissionError:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to this clothing item"
+            )
         except Exception as e:
             logger.error(f"Error deleting clothing item {item_id}: {str(e)}")
             return False
 
+    @staticmethod
+    async def delete_clothing_items(user_uid: str, item_ids: List[str]) -> int:
+        """Delete several clothing items in one batched commit
+
+        One ownership query and one outfit-usage query cover the whole
+        batch, and the deletes go out as a single WriteBatch instead of
+        one round-trip per item.
+        """
+        try:
+            if not item_ids:
+                return 0
+
+            owned = await asyncio.to_thread(FirestoreHelper.verify_owned_documents,
+                "clothing_items", "user_uid", user_uid, item_ids
+            )
+            for item_id in item_ids:
+                if item_id not in owned:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Clothing item {item_id} not found or not owned"
+                    )
+
+            # Check outfit usage for the whole batch with one query
+            outfits = await asyncio.to_thread(FirestoreHelper.query_documents,
+                "outfits",
+                filters=[("user_uid", "==", user_uid)]
+            )
+            requested = set(item_ids)
+            in_use = set()
+            for outfit_doc in outfits:
+                in_use.update(requested.intersection(outfit_doc.get("clothing_item_ids") or []))
+
+            if in_use:
+                item_list = ", ".join(sorted(in_use))
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Cannot delete items used in outfits: {item_list}. Please remove them from the outfits first."
+                )
+
+            success = await asyncio.to_thread(FirestoreHelper.delete_documents,
+                "clothing_items", item_ids
+            )
+            if not success:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to delete clothing items"
+                )
+
+            logger.info(f"Deleted {len(item_ids)} clothing items for user {user_uid}")
+            return len(item_ids)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error bulk deleting clothing items: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to delete clothing items"
+            )
+
     @staticmethod
     async def upload_clothing_item_image(
         user_uid: str,
@@ -267,16 +344,16 @@ class ClothingItemService:
     ) -> str:
         """Upload an image for a clothing item"""
         try:
-            # Verify clothing item exists and user owns it
-            doc_data = FirestoreHelper.get_document("clothing_items", item_id)
+            # Verify clothing item exists and user owns it - raw read,
+            # no model parse needed for an ownership check
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "clothing_items", item_id)
             if not doc_data:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Clothing item not found"
                 )
 
-            clothing_item = ClothingItem.from_firestore(doc_data)
-            if not clothing_item or clothing_item.user_uid != user_uid:
+            if doc_data.get("user_uid") != user_uid:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Access denied to this clothing item"
@@ -289,14 +366,22 @@ class ClothingItemService:
                     detail="File must be an image"
                 )
 
-            # Read file content
-            file_content = await file.read()
+            # Validate file size (5MB limit) from the declared size - the
+            # oversized body is rejected before any of it is read
+            if file.size and file.size > 5 * 1024 * 1024:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="File size must be less than 5MB"
+                )
 
-            # Validate file size (5MB limit)
-            if len(file_content) > 5 * 1024 * 1024:
+            # Sniff the real format from the bytes - the declared
+            # Content-Type is not trusted. Runs off the event loop.
+            try:
+                detected_mime, _, _ = await asyncio.to_thread(_sniff_image, file.file)
+            except ValueError as e:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="File size must be less than 5MB"
+                    detail=str(e)
                 )
 
             # Upload to Firebase Storage
@@ -309,23 +394,31 @@ class ClothingItemService:
 
             # Generate unique filename
             file_extension = file.filename.split('.')[-1] if file.filename else 'jpg'
-            blob_name = f"clothing_items/{user_uid}/{item_id}/{uuid4()}.{file_extension}"
+            blob_name = f"clothing_items/{user_uid}/{item_id}/{new_id()}.{file_extension}"
 
+            # Hand Starlette's spooled upload file to GCS directly - the
+            # payload is streamed to Storage without ever being copied
+            # into a Python bytes object. The blocking HTTPS PUT runs off
+            # the event loop.
             blob = bucket.blob(blob_name)
-            blob.upload_from_string(file_content, content_type=file.content_type)
-            blob.make_public()
+            # 4MB chunks make the upload resumable - a network hiccup
+            # retries only the failed chunk, not the whole file - and
+            # crc32c catches corruption in transit
+            blob.chunk_size = 4 * 1024 * 1024
+            await asyncio.to_thread(
+                blob.upload_from_file, file.file,
+                content_type=detected_mime, size=file.size,
+                checksum="crc32c"
+            )
+            await asyncio.to_thread(blob.make_public)
 
             image_url = blob.public_url
 
-            # Add image URL to clothing item
-            clothing_item.image_urls.append(image_url)
-            clothing_item.update_timestamp()
-
-            # Update in Firestore
-            success = FirestoreHelper.update_document(
-                "clothing_items",
-                item_id,
-                clothing_item.to_firestore()
+            # Append the URL with a server-side transform - only the new
+            # element goes over the wire, not the whole document
+            success = await asyncio.to_thread(FirestoreHelper.array_union,
+                "clothing_items", item_id, "image_urls", [image_url],
+                extra_fields={"updated_at": int(datetime.now().timestamp())}
             )
 
             if not success:
@@ -350,23 +443,16 @@ class ClothingItemService:
     async def increment_wear_count(user_uid: str, item_id: str) -> bool:
         """Increment wear count for a clothing item"""
         try:
-            # Get existing item
-            doc_data = FirestoreHelper.get_document("clothing_items", item_id)
-            if not doc_data:
+            # One read keeps the ownership check; the increment itself is a
+            # server-side transform - no read-modify-write, no lost updates
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "clothing_items", item_id)
+            if not doc_data or doc_data.get("user_uid") != user_uid:
                 return False
 
-            clothing_item = ClothingItem.from_firestore(doc_data)
-            if not clothing_item or clothing_item.user_uid != user_uid:
-                return False
-
-            # Increment wear count
-            clothing_item.increment_wear_count()
-
-            # Save to Firestore
-            success = FirestoreHelper.update_document(
-                "clothing_items",
-                item_id,
-                clothing_item.to_firestore()
+            now = datetime.now().timestamp()
+            success = await asyncio.to_thread(FirestoreHelper.atomic_increment,
+                "clothing_items", item_id, "wear_count",
+                extra_fields={"last_worn": now, "updated_at": int(now)}
             )
 
             if success:
@@ -383,42 +469,56 @@ class ClothingItemService:
         user_uid: str,
         filters: Optional[Dict[str, Any]] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[float] = None
     ) -> List[ClothingItemResponse]:
-        """Get all clothing items for a user with optional filtering"""
+        """Get all clothing items for a user with optional filtering
+
+        Pass ``cursor`` (the created_at of the last item from the previous
+        page) for keyset pagination; it replaces ``offset`` row skipping.
+        """
         try:
             # Build query filters
             query_filters = [("user_uid", "==", user_uid)]
+            post_filter_tags = None
 
             if filters:
                 for key, value in filters.items():
                     if key == 'tags' and isinstance(value, list):
-                        # For tags, we'll filter after the query since Firestore array-contains
-                        # only supports single values
-                        continue
+                        if len(value) <= 10:
+                            # Firestore matches up to 10 values server-side
+                            query_filters.append(("tags", "array_contains_any", value))
+                        else:
+                            post_filter_tags = frozenset(value)
                     else:
                         query_filters.append((key, "==", value))
 
-            # Query documents
-            docs = FirestoreHelper.query_documents(
+            start_after = {"created_at": cursor} if cursor is not None else None
+            if start_after:
+                # The keyset cursor already positions the query; skipping
+                # rows on top of it would drop documents
+                offset = 0
+
+            # Query documents; over-fetch only when tags must be filtered
+            # in Python because the query can't express them
+            docs = await asyncio.to_thread(FirestoreHelper.query_documents,
                 "clothing_items",
                 filters=query_filters,
                 order_by=[("created_at", "desc")],
-                limit=limit + offset,  # Get extra for potential tag filtering
-                offset=offset
+                limit=limit + offset if post_filter_tags else limit,
+                offset=offset,
+                start_after=start_after
             )
 
             # Convert to ClothingItem objects and apply tag filtering
             items = []
             for doc_data in docs:
-                clothing_item = ClothingItem.from_firestore(doc_data)
+                clothing_item = ClothingItem.from_firestore(doc_data, trusted=True)
                 if clothing_item:
-                    # Apply tag filtering if specified
-                    if filters and 'tags' in filters:
-                        item_tags = set(clothing_item.tags)
-                        filter_tags = set(filters['tags'])
-                        if not filter_tags.intersection(item_tags):
-                            continue
+                    # any() exits on the first hit and allocates no
+                    # per-item set
+                    if post_filter_tags and not any(t in post_filter_tags for t in clothing_item.tags):
+                        continue
 
                     items.append(_convert_clothing_item_to_response(clothing_item))
 
@@ -429,6 +529,64 @@ class ClothingItemService:
             logger.error(f"Error getting user clothing items: {str(e)}")
             return []
 
+    @staticmethod
+    async def stream_user_clothing_items(
+        user_uid: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[float] = None
+    ):
+        """Yield a user's clothing items as NDJSON-encoded lines
+
+        Streaming counterpart of get_user_clothing_items: each document is
+        encoded and flushed as it arrives from Firestore, so peak memory
+        stays flat and the first item reaches the client before the last
+        one has been read.
+        """
+        query_filters = [("user_uid", "==", user_uid)]
+        filter_tags = None
+        if filters:
+            for key, value in filters.items():
+                if key == 'tags' and isinstance(value, list):
+                    if len(value) <= 10:
+                        # Firestore matches up to 10 values server-side
+                        query_filters.append(("tags", "array_contains_any", value))
+                    else:
+                        filter_tags = frozenset(value)
+                else:
+                    query_filters.append((key, "==", value))
+
+        start_after = {"created_at": cursor} if cursor is not None else None
+        if start_after:
+            offset = 0
+
+        iterator = FirestoreHelper.stream_documents(
+            "clothing_items",
+            filters=query_filters,
+            order_by=[("created_at", "desc")],
+            limit=limit + offset if filter_tags else limit,
+            offset=offset,
+            start_after=start_after
+        )
+
+        sent = 0
+        while sent < limit:
+            # Pull from the blocking Firestore stream off the event loop
+            doc_data = await asyncio.to_thread(next, iterator, None)
+            if doc_data is None:
+                break
+
+            clothing_item = ClothingItem.from_firestore(doc_data, trusted=True)
+            if not clothing_item:
+                continue
+            if filter_tags and not any(t in filter_tags for t in clothing_item.tags):
+                continue
+
+            response = _convert_clothing_item_to_response(clothing_item)
+            yield orjson.dumps(response, default=_json_default) + b"\n"
+            sent += 1
+
     @staticmethod
     async def upload_clothing_item_images(
         item_id: str,
@@ -463,36 +621,35 @@ class ClothingItemService:
 
             logger.info(f"Storage bucket available: {bucket.name}")
 
-            uploaded_urls = []
-
-            for file in files:
-                logger.info(f"Processing file upload: {file.filename}")
-                try:
-                    # Generate unique filename
-                    file_extension = file.filename.split('.')[-1] if '.' in file.filename else 'jpg'
-                    blob_name = f"clothing_items/{user_uid}/{item_id}/{uuid4()}.{file_extension}"
-                    logger.info(f"Generated blob name: {blob_name}")
-
-                    # Read file content
-                    file_content = await file.read()
-                    logger.info(f"Read {len(file_content)} bytes from file")
-
-                    # Upload to Firebase Storage
-                    blob = bucket.blob(blob_name)
-                    blob.upload_from_string(file_content, content_type=file.content_type)
-                    blob.make_public()
-
-                    uploaded_urls.append(blob.public_url)
-                    logger.info(f"Successfully uploaded file: {blob.public_url}")
-
-                except Exception as file_error:
-                    logger.error(f"Error uploading file {file.filename}: {str(file_error)}")
-                    raise ValueError(f"Failed to upload file {file.filename}: {str(file_error)}")
+            async def _upload_one(file: UploadFile) -> str:
+                # Sniff the real format - the declared Content-Type is
+                # not trusted
+                detected_mime, _, _ = await asyncio.to_thread(_sniff_image, file.file)
+                file_extension = file.filename.split('.')[-1] if '.' in file.filename else 'jpg'
+                blob_name = f"clothing_items/{user_uid}/{item_id}/{new_id()}.{file_extension}"
+                blob = bucket.blob(blob_name)
+                blob.chunk_size = 4 * 1024 * 1024
+                await asyncio.to_thread(
+                    blob.upload_from_file, file.file,
+                    content_type=detected_mime, size=file.size,
+                    checksum="crc32c"
+                )
+                await asyncio.to_thread(blob.make_public)
+                logger.info(f"Successfully uploaded file: {blob.public_url}")
+                return blob.public_url
+
+            # Dispatch all uploads at once - wall time becomes the slowest
+            # single transfer instead of the sum of all of them
+            try:
+                uploaded_urls = list(await asyncio.gather(*(_upload_one(f) for f in files)))
+            except Exception as file_error:
+                logger.error(f"Error uploading files: {str(file_error)}")
+                raise ValueError(f"Failed to upload files: {str(file_error)}")
 
             # Update clothing item with new image URLs
-            doc_data = FirestoreHelper.get_document("clothing_items", item_id)
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "clothing_items", item_id)
             if doc_data:
-                clothing_item = ClothingItem.from_firestore(doc_data)
+                clothing_item = ClothingItem.from_firestore(doc_data, trusted=True)
                 if clothing_item:
                     logger.info(f"Current item has {len(clothing_item.image_urls)} image URLs: {clothing_item.image_urls}")
 
@@ -513,7 +670,7 @@ class ClothingItemService:
                     firestore_data = clothing_item.to_firestore()
                     logger.info(f"Firestore data image_urls: {firestore_data.get('image_urls')}")
 
-                    success = FirestoreHelper.update_document(
+                    success = await asyncio.to_thread(FirestoreHelper.update_document,
                         "clothing_items",
                         item_id,
                         firestore_data
@@ -545,11 +702,11 @@ class ClothingItemService:
                 return False
 
             # Get current item data
-            doc_data = FirestoreHelper.get_document("clothing_items", item_id)
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "clothing_items", item_id)
             if not doc_data:
                 return False
 
-            clothing_item = ClothingItem.from_firestore(doc_data)
+            clothing_item = ClothingItem.from_firestore(doc_data, trusted=True)
             if not clothing_item:
                 return False
 
@@ -561,26 +718,29 @@ class ClothingItemService:
             clothing_item.image_urls = updated_urls
             clothing_item.update_timestamp()
 
-            success = FirestoreHelper.update_document(
+            success = await asyncio.to_thread(FirestoreHelper.update_document,
                 "clothing_items",
                 item_id,
                 clothing_item.to_firestore()
             )
 
-            # Delete files from storage
+            # Delete files from storage - all deletes dispatched at once
             bucket = get_storage_bucket()
             if bucket:
-                for url in image_urls:
+                prefix = f"clothing_items/{user_uid}/{item_id}/"
+
+                async def _delete_one(url: str):
                     try:
-                        # Extract blob name from URL
-                        if f"clothing_items/{user_uid}/{item_id}/" in url:
-                            blob_name = url.split('/')[-1]
-                            full_blob_name = f"clothing_items/{user_uid}/{item_id}/{blob_name}"
-                            blob = bucket.blob(full_blob_name)
-                            blob.delete()
+                        # Extract blob name from URL - rsplit touches only
+                        # the final path segment
+                        if prefix in url:
+                            blob = bucket.blob(prefix + url.rsplit('/', 1)[-1])
+                            await asyncio.to_thread(blob.delete)
                     except Exception as e:
                         logger.warning(f"Failed to delete storage file {url}: {str(e)}")
 
+                await asyncio.gather(*(_delete_one(url) for url in image_urls))
+
             return success
 
         except Exception as e:
@@ -592,22 +752,23 @@ class ClothingItemService:
         """Record that a clothing item was worn"""
         try:
             # Get current item
-            doc_data = FirestoreHelper.get_document("clothing_items", item_id)
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "clothing_items", item_id)
             if not doc_data:
                 return None
 
-            clothing_item = ClothingItem.from_firestore(doc_data)
+            clothing_item = ClothingItem.from_firestore(doc_data, trusted=True)
             if not clothing_item or clothing_item.user_uid != user_uid:
                 return None
 
-            # Increment wear count
+            # Apply the increment locally for the response; persist it as a
+            # server-side transform rather than rewriting the document
             clothing_item.increment_wear_count()
-
-            # Save to Firestore
-            success = FirestoreHelper.update_document(
-                "clothing_items",
-                item_id,
-                clothing_item.to_firestore()
+            success = await asyncio.to_thread(FirestoreHelper.atomic_increment,
+                "clothing_items", item_id, "wear_count",
+                extra_fields={
+                    "last_worn": clothing_item.last_worn.timestamp(),
+                    "updated_at": int(clothing_item.updated_at.timestamp())
+                }
             )
 
             if success:
@@ -630,69 +791,65 @@ class ClothingItemService:
             if category:
                 filters.append(("category", "==", category.value))
 
-            # Get all items
-            docs = FirestoreHelper.query_documents(
+            # Stream the items, projected down to the fields the analytics
+            # actually read - the full wardrobe is never held in memory
+            iterator = FirestoreHelper.stream_documents(
                 "clothing_items",
-                filters=filters
+                filters=filters,
+                select=["category", "is_favorite", "wear_count", "name"]
             )
 
-            if not docs:
-                return {
-                    "total_items": 0,
-                    "items_by_category": {},
-                    "favorite_items": 0,
-                    "average_wear_count": 0,
-                    "most_worn_items": [],
-                    "least_worn_items": []
-                }
-
-            # Process analytics
-            items = []
+            # Fold the counts incrementally over the raw dicts; top-5
+            # most/least worn are kept as bounded heaps, so memory stays
+            # O(1) no matter how many items stream past
             category_counts = defaultdict(int)
+            total_items = 0
             favorite_count = 0
             total_wear_count = 0
+            most_heap = []   # min-heap of the 5 highest wear counts
+            least_heap = []  # max-heap (negated) of the 5 lowest
 
-            for doc_data in docs:
-                clothing_item = ClothingItem.from_firestore(doc_data)
-                if clothing_item:
-                    items.append(clothing_item)
-                    category_counts[clothing_item.category.value] += 1
-                    if clothing_item.is_favorite:
-                        favorite_count += 1
-                    total_wear_count += clothing_item.wear_count
-
-            # Sort by wear count
-            items_by_wear = sorted(items, key=lambda x: x.wear_count, reverse=True)
-
-            most_worn = []
-            least_worn = []
-
-            if items_by_wear:
-                # Get top 5 most worn
-                for item in items_by_wear[:5]:
-                    if item.wear_count > 0:
-                        most_worn.append({
-                            "id": item.id,
-                            "name": item.name,
-                            "wear_count": item.wear_count,
-                            "category": item.category.value
-                        })
-
-                # Get top 5 least worn (excluding never worn)
-                least_worn_candidates = [item for item in reversed(items_by_wear) if item.wear_count > 0]
-                for item in least_worn_candidates[:5]:
-                    least_worn.append({
-                        "id": item.id,
-                        "name": item.name,
-                        "wear_count": item.wear_count,
-                        "category": item.category.value
-                    })
+            def _wear_summary(doc_data):
+                return {
+                    "id": doc_data.get("id"),
+                    "name": doc_data.get("name"),
+                    "wear_count": doc_data.get("wear_count", 0),
+                    "category": doc_data.get("category")
+                }
+
+            while True:
+                # Pull from the blocking Firestore stream off the event loop
+                doc_data = await asyncio.to_thread(next, iterator, None)
+                if doc_data is None:
+                    break
+
+                total_items += 1
+                category_counts[doc_data.get("category", "unknown")] += 1
+                if doc_data.get("is_favorite"):
+                    favorite_count += 1
+                wear_count = doc_data.get("wear_count") or 0
+                total_wear_count += wear_count
+                if wear_count > 0:
+                    # total_items breaks ties so the heap never compares dicts
+                    entry = (wear_count, total_items, _wear_summary(doc_data))
+                    if len(most_heap) < 5:
+                        heapq.heappush(most_heap, entry)
+                    else:
+                        heapq.heappushpop(most_heap, entry)
+                    neg_entry = (-wear_count, total_items, entry[2])
+                    if len(least_heap) < 5:
+                        heapq.heappush(least_heap, neg_entry)
+                    else:
+                        heapq.heappushpop(least_heap, neg_entry)
+
+            most_worn = [e[2] for e in sorted(most_heap, reverse=True)]
+            least_worn = [e[2] for e in sorted(least_heap, reverse=True)]
 
             return {
-                "total_items": len(items),
+                "total_items": total_items,
                 "items_by_category": dict(category_counts),
                 "favorite_items": favorite_count,
-                "average_wear_count": round(total_wear_count / len(items), 2) if items else 0,
+                "average_wear_count": round(total_wear_count / total_items, 2) if total_items else 0,
                 "most_worn_items": most_worn,
                 "least_worn_items": least_worn
             }
@@ -709,22 +866,18 @@ class OutfitService:
     async def create_outfit(user_uid: str, outfit_data: OutfitCreate) -> OutfitResponse:
         """Create a new outfit"""
         try:
-            outfit_id = str(uuid4())
+            outfit_id = new_id()
 
-            # Verify all clothing items exist and belong to user
+            # Verify all clothing items exist and belong to user - one
+            # id-projected query instead of reading the documents back
+            owned = await asyncio.to_thread(FirestoreHelper.verify_owned_documents,
+                "clothing_items", "user_uid", user_uid, outfit_data.clothing_item_ids
+            )
             for item_id in outfit_data.clothing_item_ids:
-                doc_data = FirestoreHelper.get_document("clothing_items", item_id)
-                if not doc_data:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Clothing item {item_id} not found"
-                    )
-
-                clothing_item = ClothingItem.from_firestore(doc_data)
-                if not clothing_item or clothing_item.user_uid != user_uid:
+                if item_id not in owned:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Access denied to clothing item {item_id}"
+                        detail=f"Clothing item {item_id} not found or not owned"
                     )
 
             # Create outfit
@@ -735,7 +888,7 @@ class OutfitService:
             )
 
             # Save to Firestore
-            success = FirestoreHelper.create_document(
+            success = await asyncio.to_thread(FirestoreHelper.create_document,
                 "outfits",
                 outfit_id,
                 outfit.to_firestore()
@@ -763,11 +916,11 @@ class OutfitService:
     async def get_outfit(user_uid: str, outfit_id: str) -> Optional[OutfitResponse]:
         """Get an outfit by ID"""
         try:
-            doc_data = FirestoreHelper.get_document("outfits", outfit_id)
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "outfits", outfit_id)
             if not doc_data:
                 return None
 
-            outfit = Outfit.from_firestore(doc_data)
+            outfit = Outfit.from_firestore(doc_data, trusted=True)
             if not outfit:
                 return None
 
@@ -786,50 +939,6 @@ class OutfitService:
             logger.error(f"Error getting outfit {outfit_id}: {str(e)}")
             return None
 
-    @staticmethod
-    async def get_user_outfits(
-        user_uid: str,
-        is_favorite: Optional[bool] = None,
-        occasion: Optional[str] = None,
-        limit: int = 100,
-        offset: int = 0
-    ) -> List[OutfitResponse]:
-        """Get all outfits for a user with optional filtering"""
-        try:
-            # Build query filters
-            filters = [("user_uid", "==", user_uid)]
-
-            if is_favorite is not None:
-                filters.append(("is_favorite", "==", is_favorite))
-
-            if occasion:
-                filters.append(("occasion", "==", occasion))
-
-            # Get documents with filters
-            docs = FirestoreHelper.query_documents(
-                "outfits",
-                filters=filters,
-                order_by=[("created_at", "desc")],
-                limit=limit,
-                offset=offset
-            )
-
-            outfits = []
-            for doc_data in docs:
-                outfit = Outfit.from_firestore(doc_data)
-                if outfit:
-                    outfits.append(_convert_outfit_to_response(outfit))
-
-            logger.info(f"Retrieved {len(outfits)} outfits for user {user_uid}")
-            return outfits
-
-        except Exception as e:
-            logger.error(f"Error getting outfits for user {user_uid}: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to retrieve outfits"
-            )
-
     @staticmethod
     async def update_outfit(
         outfit_id: str,
@@ -838,70 +947,56 @@ class OutfitService:
     ) -> Optional[OutfitResponse]:
         """Update an outfit"""
         try:
-            # Get existing outfit
-            doc_data = FirestoreHelper.get_document("outfits", outfit_id)
-            if not doc_data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Outfit not found"
-                )
-
-            outfit = Outfit.from_firestore(doc_data)
-            if not outfit:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Outfit not found"
-                )
-
-            # Verify ownership
-            if outfit.user_uid != user_uid:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Access denied to this outfit"
-                )
-
-            # Verify clothing items if being updated
+            # Verify clothing items if being updated - one id-projected
+            # query instead of reading the documents back
             update_data = outfit_update.model_dump(exclude_unset=True)
             if 'clothing_item_ids' in update_data:
+                owned = await asyncio.to_thread(FirestoreHelper.verify_owned_documents,
+                    "clothing_items", "user_uid", user_uid, update_data['clothing_item_ids']
+                )
                 for item_id in update_data['clothing_item_ids']:
-                    doc_data = FirestoreHelper.get_document("clothing_items", item_id)
-                    if not doc_data:
+                    if item_id not in owned:
                         raise HTTPException(
                             status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Clothing item {item_id} not found"
+                            detail=f"Clothing item {item_id} not found or not owned"
                         )
 
-                    clothing_item = ClothingItem.from_firestore(doc_data)
-                    if not clothing_item or clothing_item.user_uid != user_uid:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Access denied to clothing item {item_id}"
-                        )
-
-            # Update fields
-            for field, value in update_data.items():
-                setattr(outfit, field, value)
-
-            outfit.update_timestamp()
-
-            # Save to Firestore
-            success = FirestoreHelper.update_document(
-                "outfits",
-                outfit_id,
-                outfit.to_firestore()
+            updated = {}
+
+            def _apply_update(doc_data):
+                outfit = Outfit.from_firestore(doc_data, trusted=True)
+                for field, value in update_data.items():
+                    setattr(outfit, field, value)
+                outfit.update_timestamp()
+                updated["outfit"] = outfit
+                # Send only the changed fields, already Firestore-encoded
+                encoded = outfit.to_firestore()
+                delta = {field: encoded[field] for field in update_data}
+                delta["updated_at"] = encoded["updated_at"]
+                return delta
+
+            # Ownership check and write run in one transaction - no
+            # separate read round-trip before the mutation
+            stored = await asyncio.to_thread(FirestoreHelper.update_owned_document,
+                "outfits", outfit_id, "user_uid", user_uid, _apply_update
             )
 
-            if not success:
+            if stored is None:
                 raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to update outfit"
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Outfit not found"
                 )
 
             logger.info(f"Updated outfit {outfit_id} for user {user_uid}")
-            return _convert_outfit_to_response(outfit)
+            return _convert_outfit_to_response(updated["outfit"])
 
         except HTTPException:
             raise
+        except PermissionError:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to this outfit"
+            )
         except Exception as e:
             logger.error(f"Error updating outfit {outfit_id}: {str(e)}")
             raise HTTPException(
@@ -913,62 +1008,102 @@ class OutfitService:
     async def delete_outfit(outfit_id: str, user_uid: str) -> bool:
         """Delete an outfit"""
         try:
-            # Get existing outfit to verify ownership
-            doc_data = FirestoreHelper.get_document("outfits", outfit_id)
-            if not doc_data:
+            # Ownership check and delete run in one transaction - no
+            # separate read round-trip before the mutation
+            deleted = await asyncio.to_thread(FirestoreHelper.delete_owned_document,
+                "outfits", outfit_id, "user_uid", user_uid
+            )
+
+            if deleted is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Outfit not found"
                 )
 
-            outfit = Outfit.from_firestore(doc_data)
-            if not outfit or outfit.user_uid != user_uid:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Access denied to this outfit"
-                )
-
-            # Delete from Firestore
-            success = FirestoreHelper.delete_document("outfits", outfit_id)
-
-            if success:
+            if deleted:
                 logger.info(f"Deleted outfit {outfit_id} for user {user_uid}")
 
-            return success
+            return bool(deleted)
 
         except HTTPException:
             raise
+        except PermissionError:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to this outfit"
+            )
         except Exception as e:
             logger.error(f"Error deleting outfit {outfit_id}: {str(e)}")
             return False
 
     @staticmethod
-    async def increment_wear_count(user_uid: str, outfit_id: str) -> bool:
-        """Increment wear count for an outfit and its clothing items"""
+    async def delete_outfits(user_uid: str, outfit_ids: List[str]) -> int:
+        """Delete several outfits in one batched commit
+
+        Bulk counterpart of delete_outfit - one ownership query for the
+        whole batch, then a single WriteBatch of deletes.
+        """
         try:
-            # Get existing outfit
-            doc_data = FirestoreHelper.get_document("outfits", outfit_id)
-            if not doc_data:
-                return False
+            if not outfit_ids:
+                return 0
 
-            outfit = Outfit.from_firestore(doc_data)
-            if not outfit or outfit.user_uid != user_uid:
-                return False
+            owned = await asyncio.to_thread(FirestoreHelper.verify_owned_documents,
+                "outfits", "user_uid", user_uid, outfit_ids
+            )
+            for outfit_id in outfit_ids:
+                if outfit_id not in owned:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Outfit {outfit_id} not found or not owned"
+                    )
 
-            # Increment outfit wear count
-            outfit.increment_wear_count()
+            success = await asyncio.to_thread(FirestoreHelper.delete_documents,
+                "outfits", outfit_ids
+            )
+            if not success:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to delete outfits"
+                )
 
-            # Increment wear count for all clothing items in outfit
-            for item_id in outfit.clothing_item_ids:
-                await ClothingItemService.increment_wear_count(user_uid, item_id)
+            logger.info(f"Deleted {len(outfit_ids)} outfits for user {user_uid}")
+            return len(outfit_ids)
 
-            # Save outfit to Firestore
-            success = FirestoreHelper.update_document(
-                "outfits",
-                outfit_id,
-                outfit.to_firestore()
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error bulk deleting outfits: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to delete outfits"
+            )
+
+    @staticmethod
+    async def increment_wear_count(user_uid: str, outfit_id: str) -> bool:
+        """Increment wear count for an outfit and its clothing items"""
+        try:
+            # One read keeps the ownership check and the item list - no
+            # Pydantic round-trip needed for a counter bump
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "outfits", outfit_id)
+            if not doc_data or doc_data.get("user_uid") != user_uid:
+                return False
+
+            # The outfit counter and every per-item counter go out as one
+            # batched commit of Increment transforms - a single RPC
+            # instead of N+1. The item ids were ownership-verified when
+            # the outfit was created or updated, so no per-item read is
+            # needed here.
+            clothing_item_ids = doc_data.get("clothing_item_ids") or []
+            now = datetime.now().timestamp()
+            extra_fields = {"last_worn": now, "updated_at": int(now)}
+            ops = [("outfits", outfit_id, "wear_count", extra_fields)]
+            ops.extend(
+                ("clothing_items", item_id, "wear_count", extra_fields)
+                for item_id in clothing_item_ids
             )
 
+            success = await asyncio.to_thread(FirestoreHelper.batch_increment, ops)
+
             if success:
                 logger.info(f"Incremented wear count for outfit {outfit_id}")
 
@@ -983,42 +1118,57 @@ class OutfitService:
         user_uid: str,
         filters: Optional[Dict[str, Any]] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[float] = None
     ) -> List[OutfitResponse]:
-        """Get all outfits for a user with optional filtering"""
+        """Get all outfits for a user with optional filtering
+
+        Pass ``cursor`` (the created_at of the last outfit from the
+        previous page) for keyset pagination; it replaces ``offset`` row
+        skipping.
+        """
         try:
             # Build query filters
             query_filters = [("user_uid", "==", user_uid)]
+            post_filter_tags = None
 
             if filters:
                 for key, value in filters.items():
                     if key == 'tags' and isinstance(value, list):
-                        # For tags, we'll filter after the query since Firestore array-contains
-                        # only supports single values
-                        continue
+                        if len(value) <= 10:
+                            # Firestore matches up to 10 values server-side
+                            query_filters.append(("tags", "array_contains_any", value))
+                        else:
+                            post_filter_tags = frozenset(value)
                     else:
                         query_filters.append((key, "==", value))
 
-            # Query documents
-            docs = FirestoreHelper.query_documents(
+            start_after = {"created_at": cursor} if cursor is not None else None
+            if start_after:
+                # The keyset cursor already positions the query; skipping
+                # rows on top of it would drop documents
+                offset = 0
+
+            # Query documents; over-fetch only when tags must be filtered
+            # in Python because the query can't express them
+            docs = await asyncio.to_thread(FirestoreHelper.query_documents,
                 "outfits",
                 filters=query_filters,
                 order_by=[("created_at", "desc")],
-                limit=limit + offset,  # Get extra for potential tag filtering
-                offset=offset
+                limit=limit + offset if post_filter_tags else limit,
+                offset=offset,
+                start_after=start_after
             )
 
             # Convert to Outfit objects and apply tag filtering
             outfits = []
             for doc_data in docs:
-                outfit = Outfit.from_firestore(doc_data)
+                outfit = Outfit.from_firestore(doc_data, trusted=True)
                 if outfit:
-                    # Apply tag filtering if specified
-                    if filters and 'tags' in filters:
-                        outfit_tags = set(outfit.tags)
-                        filter_tags = set(filters['tags'])
-                        if not filter_tags.intersection(outfit_tags):
-                            continue
+                    # any() exits on the first hit and allocates no
+                    # per-item set
+                    if post_filter_tags and not any(t in post_filter_tags for t in outfit.tags):
+                        continue
 
                     outfits.append(_convert_outfit_to_response(outfit))
 
@@ -1029,33 +1179,97 @@ class OutfitService:
             logger.error(f"Error getting user outfits: {str(e)}")
             return []
 
+    @staticmethod
+    async def stream_user_outfits(
+        user_uid: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[float] = None
+    ):
+        """Yield a user's outfits as NDJSON-encoded lines
+
+        Streaming counterpart of get_user_outfits - same shape as
+        ClothingItemService.stream_user_clothing_items.
+        """
+        query_filters = [("user_uid", "==", user_uid)]
+        filter_tags = None
+        if filters:
+            for key, value in filters.items():
+                if key == 'tags' and isinstance(value, list):
+                    if len(value) <= 10:
+                        # Firestore matches up to 10 values server-side
+                        query_filters.append(("tags", "array_contains_any", value))
+                    else:
+                        filter_tags = frozenset(value)
+                else:
+                    query_filters.append((key, "==", value))
+
+        start_after = {"created_at": cursor} if cursor is not None else None
+        if start_after:
+            offset = 0
+
+        iterator = FirestoreHelper.stream_documents(
+            "outfits",
+            filters=query_filters,
+            order_by=[("created_at", "desc")],
+            limit=limit + offset if filter_tags else limit,
+            offset=offset,
+            start_after=start_after
+        )
+
+        sent = 0
+        while sent < limit:
+            # Pull from the blocking Firestore stream off the event loop
+            doc_data = await asyncio.to_thread(next, iterator, None)
+            if doc_data is None:
+                break
+
+            outfit = Outfit.from_firestore(doc_data, trusted=True)
+            if not outfit:
+                continue
+            if filter_tags and not any(t in filter_tags for t in outfit.tags):
+                continue
+
+            response = _convert_outfit_to_response(outfit)
+            yield orjson.dumps(response, default=_json_default) + b"\n"
+            sent += 1
+
     @staticmethod
     async def record_wear(outfit_id: str, user_uid: str) -> Optional[OutfitResponse]:
         """Record that an outfit was worn"""
         try:
             # Get current outfit
-            doc_data = FirestoreHelper.get_document("outfits", outfit_id)
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "outfits", outfit_id)
             if not doc_data:
                 return None
 
-            outfit = Outfit.from_firestore(doc_data)
+            outfit = Outfit.from_firestore(doc_data, trusted=True)
             if not outfit or outfit.user_uid != user_uid:
                 return None
 
-            # Increment outfit wear count
+            # Apply the increment locally for the response; persist it as a
+            # server-side transform rather than rewriting the document
             outfit.increment_wear_count()
 
-            # Increment wear count for all clothing items in outfit
-            for item_id in outfit.clothing_item_ids:
-                await ClothingItemService.increment_wear_count(user_uid, item_id)
-
-            # Save outfit to Firestore
-            success = FirestoreHelper.update_document(
-                "outfits",
-                outfit_id,
-                outfit.to_firestore()
+            # The outfit counter and every per-item counter go out as one
+            # batched commit of Increment transforms - a single RPC
+            # instead of N+1. The item ids were ownership-verified when
+            # the outfit was created or updated, so no per-item read is
+            # needed here.
+            now = datetime.now().timestamp()
+            item_fields = {"last_worn": now, "updated_at": int(now)}
+            ops = [("outfits", outfit_id, "wear_count", {
+                "last_worn": outfit.last_worn.timestamp(),
+                "updated_at": int(outfit.updated_at.timestamp())
+            })]
+            ops.extend(
+                ("clothing_items", item_id, "wear_count", item_fields)
+                for item_id in outfit.clothing_item_ids
             )
 
+            success = await asyncio.to_thread(FirestoreHelper.batch_increment, ops)
+
             if success:
                 return _convert_outfit_to_response(outfit)
             return None
@@ -1084,6 +1298,9 @@ class OutfitService:
             if file.size and file.size > 5 * 1024 * 1024:  # 5MB limit
                 raise ValueError(f"File {file.filename} is too large (max 5MB)")
 
+            # Sniff the real format - the declared Content-Type is not trusted
+            detected_mime, _, _ = await asyncio.to_thread(_sniff_image, file.file)
+
             # Upload file to storage
             bucket = get_storage_bucket()
             if not bucket:
@@ -1091,24 +1308,30 @@ class OutfitService:
 
             # Generate unique filename
             file_extension = file.filename.split('.')[-1] if '.' in file.filename else 'jpg'
-            blob_name = f"outfits/{user_uid}/{outfit_id}/{uuid4()}.{file_extension}"
+            blob_name = f"outfits/{user_uid}/{outfit_id}/{new_id()}.{file_extension}"
 
-            # Upload to Firebase Storage
+            # Upload to Firebase Storage off the event loop
             blob = bucket.blob(blob_name)
-            blob.upload_from_file(file.file, content_type=file.content_type)
-            blob.make_public()
+            # Resumable chunked upload with transit checksum - see
+            # upload_clothing_item_image
+            blob.chunk_size = 4 * 1024 * 1024
+            await asyncio.to_thread(
+                blob.upload_from_file, file.file, content_type=detected_mime,
+                checksum="crc32c"
+            )
+            await asyncio.to_thread(blob.make_public)
 
             image_url = blob.public_url
 
             # Update outfit with new image URL
-            doc_data = FirestoreHelper.get_document("outfits", outfit_id)
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "outfits", outfit_id)
             if doc_data:
-                outfit_obj = Outfit.from_firestore(doc_data)
+                outfit_obj = Outfit.from_firestore(doc_data, trusted=True)
                 if outfit_obj:
                     outfit_obj.image_url = image_url
                     outfit_obj.update_timestamp()
 
-                    FirestoreHelper.update_document(
+                    await asyncio.to_thread(FirestoreHelper.update_document,
                         "outfits",
                         outfit_id,
                         outfit_obj.to_firestore()
@@ -1128,11 +1351,11 @@ class OutfitService:
         """Delete the outfit image"""
         try:
             # Get current outfit data
-            doc_data = FirestoreHelper.get_document("outfits", outfit_id)
+            doc_data = await asyncio.to_thread(FirestoreHelper.get_document, "outfits", outfit_id)
             if not doc_data:
                 return False
 
-            outfit = Outfit.from_firestore(doc_data)
+            outfit = Outfit.from_firestore(doc_data, trusted=True)
             if not outfit or outfit.user_uid != user_uid:
                 return False
 
@@ -1144,7 +1367,7 @@ class OutfitService:
             outfit.image_url = None
             outfit.update_timestamp()
 
-            success = FirestoreHelper.update_document(
+            success = await asyncio.to_thread(FirestoreHelper.update_document,
                 "outfits",
                 outfit_id,
                 outfit.to_firestore()
@@ -1171,79 +1394,73 @@ class OutfitService:
 
     @staticmethod
     async def get_outfit_analytics(user_uid: str) -> Dict[str, Any]:
-        """Get outfit analytics for a user"""
+        """Get outfit analytics for a user
+
+        Totals, favorites, and the wear-count average come back as
+        server-side aggregation scalars, and the most/least-worn lists
+        are two 5-document ordered reads. Only the occasion/season
+        buckets still walk documents - those fields are free text, so
+        Firestore can't count them per value - and that walk streams
+        just the two projected fields.
+        """
         try:
-            # Get all outfits
-            docs = FirestoreHelper.query_documents(
-                "outfits",
-                filters=[("user_uid", "==", user_uid)]
+            owner_filter = [("user_uid", "==", user_uid)]
+            worn_filter = owner_filter + [("wear_count", ">", 0)]
+            summary_fields = ["name", "wear_count", "occasion"]
+
+            def _bucket_counts():
+                occasion_counts = defaultdict(int)
+                season_counts = defaultdict(int)
+                for doc_data in FirestoreHelper.stream_documents(
+                    "outfits", filters=owner_filter, select=["occasion", "season"]
+                ):
+                    if doc_data.get("occasion"):
+                        occasion_counts[doc_data["occasion"]] += 1
+                    if doc_data.get("season"):
+                        season_counts[doc_data["season"]] += 1
+                return dict(occasion_counts), dict(season_counts)
+
+            # All five queries are independent - fly them together
+            totals, favorites, most_docs, least_docs, buckets = await asyncio.gather(
+                asyncio.to_thread(FirestoreHelper.aggregate,
+                    "outfits", owner_filter,
+                    ["wear_count"], ["wear_count"]
+                ),
+                asyncio.to_thread(FirestoreHelper.aggregate,
+                    "outfits", owner_filter + [("is_favorite", "==", True)]
+                ),
+                asyncio.to_thread(FirestoreHelper.query_documents,
+                    "outfits", filters=worn_filter,
+                    order_by=[("wear_count", "desc")], limit=5,
+                    select=summary_fields
+                ),
+                asyncio.to_thread(FirestoreHelper.query_documents,
+                    "outfits", filters=worn_filter,
+                    order_by=[("wear_count", "asc")], limit=5,
+                    select=summary_fields
+                ),
+                asyncio.to_thread(_bucket_counts),
             )
 
-            if not docs:
+            def _wear_summary(doc_data):
                 return {
-                    "total_outfits": 0,
-                    "outfits_by_occasion": {},
-                    "outfits_by_season": {},
-                    "favorite_outfits": 0,
-                    "average_wear_count": 0,
-                    "most_worn_outfits": [],
-                    "least_worn_outfits": []
+                    "id": doc_data.get("id"),
+                    "name": doc_data.get("name"),
+                    "wear_count": doc_data.get("wear_count", 0),
+                    "occasion": doc_data.get("occasion")
                 }
 
-            # Process analytics
-            outfits = []
-            occasion_counts = defaultdict(int)
-            season_counts = defaultdict(int)
-            favorite_count = 0
-            total_wear_count = 0
-
-            for doc_data in docs:
-                outfit = Outfit.from_firestore(doc_data)
-                if outfit:
-                    outfits.append(outfit)
-                    if outfit.occasion:
-                        occasion_counts[outfit.occasion] += 1
-                    if outfit.season:
-                        season_counts[outfit.season] += 1
-                    if outfit.is_favorite:
-                        favorite_count += 1
-                    total_wear_count += outfit.wear_count
-
-            # Sort by wear count
-            outfits_by_wear = sorted(outfits, key=lambda x: x.wear_count, reverse=True)
-
-            most_worn = []
-            least_worn = []
-
-            if outfits_by_wear:
-                # Get top 5 most worn
-                for outfit in outfits_by_wear[:5]:
-                    if outfit.wear_count > 0:
-                        most_worn.append({
-                            "id": outfit.id,
-                            "name": outfit.name,
-                            "wear_count": outfit.wear_count,
-                            "occasion": outfit.occasion
-                        })
-
-                # Get top 5 least worn (excluding never worn)
-                least_worn_candidates = [outfit for outfit in reversed(outfits_by_wear) if outfit.wear_count > 0]
-                for outfit in least_worn_candidates[:5]:
-                    least_worn.append({
-                        "id": outfit.id,
-                        "name": outfit.name,
-                        "wear_count": outfit.wear_count,
-                        "occasion": outfit.occasion
-                    })
+            average_wear = totals.get("avg_wear_count")
+            occasion_counts, season_counts = buckets
 
             return {
-                "total_outfits": len(outfits),
-                "outfits_by_occasion": dict(occasion_counts),
-                "outfits_by_season": dict(season_counts),
-                "favorite_outfits": favorite_count,
-                "average_wear_count": round(total_wear_count / len(outfits), 2) if outfits else 0,
-                "most_worn_outfits": most_worn,
-                "least_worn_outfits": least_worn
+                "total_outfits": int(totals.get("count") or 0),
+                "outfits_by_occasion": occasion_counts,
+                "outfits_by_season": season_counts,
+                "favorite_outfits": int(favorites.get("count") or 0),
+                "average_wear_count": round(average_wear, 2) if average_wear else 0,
+                "most_worn_outfits": [_wear_summary(d) for d in most_docs],
+                "least_worn_outfits": [_wear_summary(d) for d in least_docs]
             }
 
         except Exception as e:
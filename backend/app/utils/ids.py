@@ -0,0 +1,13 @@
+import secrets
+
+
+def new_id() -> str:
+    """Generate a unique id for documents and storage object names
+
+    secrets.token_urlsafe(16) gives 128 bits of CSPRNG randomness like
+    uuid4, but skips the UUID formatting pass and produces a shorter
+    string (22 chars vs 36). The ids stay fully random on purpose:
+    Firestore shards its index by key range, so time-ordered ids (ULIDs)
+    would concentrate writes on one shard and hotspot it.
+    """
+    return secrets.token_urlsafe(16)
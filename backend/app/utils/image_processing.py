@@ -1,11 +1,35 @@
+import asyncio
 import base64
+import functools
 import io
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, Tuple, Union
 from PIL import Image, ImageOps
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for CPU-bound PIL work. A process pool (not threads) because
+# JPEG decode/encode and resampling hold the GIL for most of their runtime;
+# created lazily so importing this module stays cheap.
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _process_pool
+
+
+def shutdown_image_pool():
+    """Shut down the image processing pool if it was created"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False)
+        _process_pool = None
+
 
 class ImageProcessingError(Exception):
     """Custom exception for image processing errors"""
@@ -191,43 +215,82 @@ class ImageProcessor:
             raise ImageProcessingError(f"Failed to convert image format: {e}")
 
     @staticmethod
-    def normalize_image(image_data: bytes) -> bytes:
+    def pipeline(
+        image_data: bytes,
+        *,
+        orient: bool = True,
+        max_size: Tuple[int, int] = DEFAULT_MAX_SIZE,
+        out_format: str = DEFAULT_FORMAT,
+        quality: int = DEFAULT_QUALITY
+    ) -> bytes:
         """
-        Normalize an image for AI processing (standard size, format, etc.)
+        Run orientation, resize and format conversion in a single decode/encode pass
 
         Args:
             image_data: Raw image bytes
+            orient: Whether to apply EXIF orientation
+            max_size: Maximum dimensions (width, height), aspect ratio preserved
+            out_format: Output format (JPEG, PNG, WEBP, etc.)
+            quality: Quality for lossy formats (1-100)
 
         Returns:
-            Normalized image bytes
+            Processed image bytes
         """
+        out_format = out_format.upper()
+        if out_format not in ImageProcessor.SUPPORTED_FORMATS:
+            raise ImageProcessingError(f"Unsupported format: {out_format}")
+
         try:
-            # First validate the image
-            if not ImageProcessor.validate_image(image_data):
-                raise ImageProcessingError("Invalid image data")
-
-            # Get image info
-            info = ImageProcessor.get_image_info(image_data)
-
-            # Resize to a standard size suitable for AI processing
-            resized_data = ImageProcessor.resize_image(
-                image_data,
-                max_size=(1024, 1024),
-                maintain_aspect_ratio=True,
-                upscale=False
-            )
-
-            # Convert to JPEG for consistency
-            normalized_data = ImageProcessor.convert_format(
-                resized_data,
-                target_format='JPEG',
-                quality=90
-            )
-
-            return normalized_data
+            with Image.open(io.BytesIO(image_data)) as img:
+                if orient:
+                    img = ImageOps.exif_transpose(img)
 
+                # Downscale in place, preserving aspect ratio (never upscales)
+                img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+                # Handle transparency for JPEG
+                if out_format == 'JPEG' and img.mode in ('RGBA', 'LA'):
+                    background = Image.new('RGB', img.size, (255, 255, 255))
+                    if img.mode == 'RGBA':
+                        background.paste(img, mask=img.split()[-1])
+                    else:
+                        background.paste(img)
+                    img = background
+
+                output = io.BytesIO()
+                save_kwargs = {'format': out_format}
+                if out_format in ('JPEG', 'WEBP'):
+                    save_kwargs['quality'] = quality
+                    save_kwargs['optimize'] = True
+                elif out_format == 'PNG':
+                    save_kwargs['optimize'] = True
+
+                img.save(output, **save_kwargs)
+                return output.getvalue()
+
+        except ImageProcessingError:
+            raise
         except Exception as e:
-            raise ImageProcessingError(f"Failed to normalize image: {e}")
+            raise ImageProcessingError(f"Failed to process image: {e}")
+
+    @staticmethod
+    def normalize_image(image_data: bytes) -> bytes:
+        """
+        Normalize an image for AI processing (standard size, format, etc.)
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            Normalized image bytes
+        """
+        return ImageProcessor.pipeline(
+            image_data,
+            orient=False,
+            max_size=(1024, 1024),
+            out_format='JPEG',
+            quality=90
+        )
 
     @staticmethod
     def auto_orient(image_data: bytes) -> bytes:
@@ -292,8 +355,9 @@ class ImageProcessor:
                     bottom = top + size_min
                     img = img.crop((left, top, right, bottom))
 
-                # Resize to thumbnail size
-                img.thumbnail(size, Image.Resampling.LANCZOS)
+                # Resize to thumbnail size; BILINEAR is ~3x faster than LANCZOS
+                # and indistinguishable at thumbnail sizes
+                img.thumbnail(size, Image.Resampling.BILINEAR)
 
                 output = io.BytesIO()
                 save_format = 'JPEG'  # Always use JPEG for thumbnails
@@ -389,44 +453,62 @@ class Base64ImageUtils:
             raise ImageProcessingError(f"Failed to extract from data URL: {e}")
 
 
-def prepare_image_for_ai(image_data: bytes) -> bytes:
+async def prepare_image_for_ai(image_data: bytes) -> bytes:
     """
     Prepare an image for AI processing by normalizing format, size, and orientation
 
+    Runs in the shared process pool so JPEG decode/encode does not block
+    the event loop.
+
     Args:
         image_data: Raw image bytes
 
     Returns:
         Processed image bytes ready for AI
     """
-    processor = ImageProcessor()
-
-    # Auto-orient the image
-    oriented_data = processor.auto_orient(image_data)
-
-    # Normalize the image
-    normalized_data = processor.normalize_image(oriented_data)
-
-    return normalized_data
-
-
-def create_image_variants(image_data: bytes) -> dict:
+    return await asyncio.get_event_loop().run_in_executor(
+        _get_process_pool(),
+        functools.partial(
+            ImageProcessor.pipeline,
+            image_data,
+            orient=True,
+            max_size=(1024, 1024),
+            out_format='JPEG',
+            quality=90
+        )
+    )
+
+
+async def create_image_variants(image_data: bytes) -> dict:
     """
     Create multiple variants of an image (thumbnail, medium, large)
 
+    The three variants are encoded concurrently in the shared process pool.
+
     Args:
         image_data: Raw image bytes
 
     Returns:
         Dictionary with different sized variants
     """
-    processor = ImageProcessor()
+    loop = asyncio.get_event_loop()
+    pool = _get_process_pool()
 
     try:
-        # Create variants
-        thumbnail = processor.create_thumbnail(image_data, size=(150, 150))
-        medium = processor.resize_image(image_data, max_size=(512, 512))
-        large = processor.resize_image(image_data, max_size=(1024, 1024))
+        thumbnail, medium, large = await asyncio.gather(
+            loop.run_in_executor(
+                pool,
+                functools.partial(ImageProcessor.create_thumbnail, image_data, size=(150, 150))
+            ),
+            loop.run_in_executor(
+                pool,
+                functools.partial(ImageProcessor.resize_image, image_data, max_size=(512, 512))
+            ),
+            loop.run_in_executor(
+                pool,
+                functools.partial(ImageProcessor.resize_image, image_data, max_size=(1024, 1024))
+            ),
+        )
 
         return {
             'thumbnail': thumbnail,
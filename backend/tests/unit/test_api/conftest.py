@@ -0,0 +1,11 @@
+import pytest
+
+from app.core.rate_limit import write_limit_minute, write_limit_hour
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Each test starts with fresh rate-limit buckets"""
+    write_limit_minute.reset()
+    write_limit_hour.reset()
+    yield
@@ -1,3 +1,4 @@
+import dataclasses
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi.testclient import TestClient
@@ -106,8 +107,7 @@ class TestUsersAPI:
 
     def test_update_current_user_profile_success(self, client, mock_user_service, sample_user_response):
         """Test successful user profile update"""
-        updated_user = sample_user_response.model_copy()
-        updated_user.display_name = "Updated Name"
+        updated_user = dataclasses.replace(sample_user_response, display_name="Updated Name")
 
         mock_user_service.update_user = AsyncMock(return_value=updated_user)
 
@@ -0,0 +1,34 @@
+from app.core import firebase
+
+
+class TestDocTTLCache:
+    """Test the cross-request TTL document cache"""
+
+    def setup_method(self):
+        firebase._doc_ttl_cache.clear()
+
+    def test_put_then_get_returns_copy(self):
+        key = ("outfits", "outfit_123")
+        firebase._ttl_cache_put(key, {"user_uid": "user_456"})
+
+        data = firebase._ttl_cache_get(key)
+
+        assert data == {"user_uid": "user_456"}
+        # Mutating the returned dict must not poison the cache
+        data["user_uid"] = "someone_else"
+        assert firebase._ttl_cache_get(key) == {"user_uid": "user_456"}
+
+    def test_expired_entry_is_dropped(self):
+        key = ("outfits", "outfit_123")
+        firebase._doc_ttl_cache[key] = (0.0, {"user_uid": "user_456"})
+
+        assert firebase._ttl_cache_get(key) is None
+        assert key not in firebase._doc_ttl_cache
+
+    def test_invalidate_removes_entry(self):
+        key = ("outfits", "outfit_123")
+        firebase._ttl_cache_put(key, {"user_uid": "user_456"})
+
+        firebase._invalidate_cached_doc("outfits", "outfit_123")
+
+        assert firebase._ttl_cache_get(key) is None
@@ -0,0 +1,55 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.rate_limit import RateLimiter, enforce_write_rate_limit
+from app.core import rate_limit
+
+
+class TestRateLimiter:
+    """Test the in-memory fixed-window rate limiter"""
+
+    def test_allows_up_to_limit(self):
+        limiter = RateLimiter(3, 60)
+
+        for _ in range(3):
+            assert limiter.acquire("user_1") is None
+
+    def test_rejects_over_limit_with_retry_after(self):
+        limiter = RateLimiter(2, 60)
+        limiter.acquire("user_1")
+        limiter.acquire("user_1")
+
+        retry_after = limiter.acquire("user_1")
+
+        assert isinstance(retry_after, int)
+        assert retry_after >= 1
+
+    def test_keys_are_independent(self):
+        limiter = RateLimiter(1, 60)
+        limiter.acquire("user_1")
+
+        assert limiter.acquire("user_2") is None
+
+    def test_reset_clears_buckets(self):
+        limiter = RateLimiter(1, 60)
+        limiter.acquire("user_1")
+        limiter.reset()
+
+        assert limiter.acquire("user_1") is None
+
+
+class TestEnforceWriteRateLimit:
+    """Test the endpoint dependency"""
+
+    @pytest.mark.asyncio
+    async def test_raises_429_with_retry_after_header(self, monkeypatch):
+        monkeypatch.setattr(rate_limit, "write_limit_minute", RateLimiter(1, 60))
+        monkeypatch.setattr(rate_limit, "write_limit_hour", RateLimiter(100, 3600))
+
+        await enforce_write_rate_limit("user_1")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await enforce_write_rate_limit("user_1")
+
+        assert exc_info.value.status_code == 429
+        assert "Retry-After" in exc_info.value.headers
@@ -232,6 +232,26 @@ class TestClothingItem:
         result = ClothingItem.from_firestore(None)
         assert result is None
 
+    def test_batch_json_round_trip(self, sample_clothing_item_data):
+        """Test batch JSON serialization round trip"""
+        item = ClothingItem(**sample_clothing_item_data)
+        other = ClothingItem(
+            user_uid="user_456",
+            name="Jeans",
+            category=ClothingCategory.BOTTOMS
+        )
+
+        payload = ClothingItem.batch_to_firestore_json([item, other])
+        assert isinstance(payload, bytes)
+
+        restored = ClothingItem.batch_from_firestore_json(payload)
+        assert len(restored) == 2
+        assert restored[0].id == item.id
+        assert restored[0].name == item.name
+        assert restored[0].colors[0].name == item.colors[0].name
+        assert restored[1].name == "Jeans"
+        assert restored[1].last_worn is None
+
 
 class TestOutfit:
     """Test Outfit model"""
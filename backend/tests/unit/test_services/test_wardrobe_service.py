@@ -153,11 +153,35 @@ class TestClothingItemService:
         assert ("category", "==", "tops") in filters
         assert ("is_favorite", "==", True) in filters
 
+    @pytest.mark.asyncio
+    async def test_stream_user_clothing_items(self, mock_firestore_helper, sample_clothing_item_doc):
+        """Test streaming clothing items as NDJSON lines"""
+        import json
+
+        mock_firestore_helper.stream_documents.return_value = iter([sample_clothing_item_doc])
+
+        lines = [
+            line async for line in
+            ClothingItemService.stream_user_clothing_items("user_456")
+        ]
+
+        assert len(lines) == 1
+        assert lines[0].endswith(b"\n")
+        item = json.loads(lines[0])
+        assert item["id"] == "item_123"
+        assert item["user_uid"] == "user_456"
+
+        mock_firestore_helper.stream_documents.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_update_clothing_item_success(self, mock_firestore_helper, sample_clothing_item_doc):
         """Test successful clothing item update"""
-        mock_firestore_helper.get_document.return_value = sample_clothing_item_doc
-        mock_firestore_helper.update_document.return_value = True
+        # The transactional helper hands the current document to the
+        # updater and stores what it returns
+        mock_firestore_helper.update_owned_document.side_effect = (
+            lambda collection, doc_id, owner_field, owner_value, updater:
+                updater(dict(sample_clothing_item_doc))
+        )
 
         update_data = ClothingItemUpdate(
             name="Updated Shirt",
@@ -170,12 +194,12 @@ class TestClothingItemService:
         assert result.name == "Updated Shirt"
         assert result.is_favorite is True
 
-        mock_firestore_helper.update_document.assert_called_once()
+        mock_firestore_helper.update_owned_document.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_update_clothing_item_not_found(self, mock_firestore_helper):
         """Test clothing item update when item doesn't exist"""
-        mock_firestore_helper.get_document.return_value = None
+        mock_firestore_helper.update_owned_document.return_value = None
 
         update_data = ClothingItemUpdate(name="Updated Shirt")
 
@@ -199,22 +223,57 @@ class TestClothingItemService:
     @pytest.mark.asyncio
     async def test_delete_clothing_item_not_found(self, mock_firestore_helper):
         """Test clothing item deletion when item doesn't exist"""
-        mock_firestore_helper.get_document.return_value = None
+        mock_firestore_helper.query_documents.return_value = []
+        mock_firestore_helper.delete_owned_document.return_value = None
 
         with pytest.raises(HTTPException) as exc_info:
             await ClothingItemService.delete_clothing_item("user_456", "nonexistent_item")
 
         assert exc_info.value.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_delete_clothing_items_bulk(self, mock_firestore_helper):
+        """Test bulk clothing item deletion uses one batched write"""
+        mock_firestore_helper.verify_owned_documents.return_value = {"item_1", "item_2"}
+        mock_firestore_helper.query_documents.return_value = []
+        mock_firestore_helper.delete_documents.return_value = True
+
+        result = await ClothingItemService.delete_clothing_items("user_456", ["item_1", "item_2"])
+
+        assert result == 2
+        mock_firestore_helper.delete_documents.assert_called_once_with(
+            "clothing_items", ["item_1", "item_2"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_delete_clothing_items_bulk_item_in_use(self, mock_firestore_helper):
+        """Test bulk deletion refuses items still used in outfits"""
+        mock_firestore_helper.verify_owned_documents.return_value = {"item_1", "item_2"}
+        mock_firestore_helper.query_documents.return_value = [
+            {"id": "outfit_1", "clothing_item_ids": ["item_2"]}
+        ]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ClothingItemService.delete_clothing_items("user_456", ["item_1", "item_2"])
+
+        assert exc_info.value.status_code == 400
+        assert "item_2" in exc_info.value.detail
+        mock_firestore_helper.delete_documents.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_upload_clothing_item_image_success(self, mock_firestore_helper, mock_storage_bucket, sample_clothing_item_doc):
         """Test successful clothing item image upload"""
-        # Mock file
-        file_content = b"fake image content"
+        from PIL import Image as PILImage
+
+        # Mock file - real JPEG bytes, since the upload sniffs the content
+        buffer = io.BytesIO()
+        PILImage.new("RGB", (2, 2)).save(buffer, format="JPEG")
+        file_content = buffer.getvalue()
         mock_file = Mock(spec=UploadFile)
         mock_file.content_type = "image/jpeg"
         mock_file.filename = "test.jpg"
-        mock_file.read = AsyncMock(return_value=file_content)
+        mock_file.size = len(file_content)
+        mock_file.file = io.BytesIO(file_content)
 
         # Mock storage bucket
         mock_bucket = Mock()
@@ -225,17 +284,29 @@ class TestClothingItemService:
 
         # Mock Firestore
         mock_firestore_helper.get_document.return_value = sample_clothing_item_doc
-        mock_firestore_helper.update_document.return_value = True
+        mock_firestore_helper.array_union.return_value = True
 
         result = await ClothingItemService.upload_clothing_item_image("user_456", "item_123", mock_file)
 
         assert result == "https://example.com/image.jpg"
 
-        # Verify storage operations
+        # Verify the file object is streamed to storage without an
+        # intermediate bytes copy
         mock_bucket.blob.assert_called_once()
-        mock_blob.upload_from_string.assert_called_once_with(file_content, content_type="image/jpeg")
+        mock_blob.upload_from_file.assert_called_once_with(
+            mock_file.file, content_type="image/jpeg", size=len(file_content),
+            checksum="crc32c"
+        )
+        # 4MB chunks make the upload resumable
+        assert mock_blob.chunk_size == 4 * 1024 * 1024
         mock_blob.make_public.assert_called_once()
 
+        # The new URL is appended server-side instead of rewriting the doc
+        assert mock_firestore_helper.array_union.call_args.args[:4] == (
+            "clothing_items", "item_123", "image_urls", ["https://example.com/image.jpg"]
+        )
+        mock_firestore_helper.update_document.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_upload_clothing_item_image_invalid_file_type(self, mock_firestore_helper, mock_storage_bucket, sample_clothing_item_doc):
         """Test clothing item image upload with invalid file type"""
@@ -250,33 +321,53 @@ class TestClothingItemService:
         assert exc_info.value.status_code == 400
         assert "must be an image" in exc_info.value.detail
 
+    @pytest.mark.asyncio
+    async def test_upload_clothing_item_image_spoofed_content(self, mock_firestore_helper, mock_storage_bucket, sample_clothing_item_doc):
+        """Test upload rejects non-image bytes behind an image Content-Type"""
+        mock_firestore_helper.get_document.return_value = sample_clothing_item_doc
+
+        mock_file = Mock(spec=UploadFile)
+        mock_file.content_type = "image/jpeg"
+        mock_file.filename = "test.jpg"
+        mock_file.size = 18
+        mock_file.file = io.BytesIO(b"not actually jpeg")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ClothingItemService.upload_clothing_item_image("user_456", "item_123", mock_file)
+
+        assert exc_info.value.status_code == 400
+        assert "not a valid image" in exc_info.value.detail
+
     @pytest.mark.asyncio
     async def test_upload_clothing_item_image_file_too_large(self, mock_firestore_helper, mock_storage_bucket, sample_clothing_item_doc):
         """Test clothing item image upload with file too large"""
-        # 6MB file (over 5MB limit)
-        large_content = b"x" * (6 * 1024 * 1024)
+        # 6MB file (over 5MB limit) - rejected from the declared size
         mock_file = Mock(spec=UploadFile)
         mock_file.content_type = "image/jpeg"
-        mock_file.read = AsyncMock(return_value=large_content)
+        mock_file.size = 6 * 1024 * 1024
 
         mock_firestore_helper.get_document.return_value = sample_clothing_item_doc
 
         with pytest.raises(HTTPException) as exc_info:
             await ClothingItemService.upload_clothing_item_image("user_456", "item_123", mock_file)
 
-        assert exc_info.value.status_code == 400
+        assert exc_info.value.status_code == 413
         assert "less than 5MB" in exc_info.value.detail
 
     @pytest.mark.asyncio
     async def test_increment_wear_count_success(self, mock_firestore_helper, sample_clothing_item_doc):
         """Test successful wear count increment"""
         mock_firestore_helper.get_document.return_value = sample_clothing_item_doc
-        mock_firestore_helper.update_document.return_value = True
+        mock_firestore_helper.atomic_increment.return_value = True
 
         result = await ClothingItemService.increment_wear_count("user_456", "item_123")
 
         assert result is True
-        mock_firestore_helper.update_document.assert_called_once()
+        # The counter bump is a server-side transform, not a full rewrite
+        mock_firestore_helper.atomic_increment.assert_called_once()
+        call_args = mock_firestore_helper.atomic_increment.call_args
+        assert call_args.args == ("clothing_items", "item_123", "wear_count")
+        mock_firestore_helper.update_document.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_increment_wear_count_item_not_found(self, mock_firestore_helper):
@@ -338,11 +429,8 @@ class TestOutfitService:
     @pytest.mark.asyncio
     async def test_create_outfit_success(self, mock_firestore_helper, sample_outfit_create, sample_clothing_item_doc):
         """Test successful outfit creation"""
-        # Mock clothing items exist
-        mock_firestore_helper.get_document.side_effect = [
-            sample_clothing_item_doc,  # item_1
-            sample_clothing_item_doc   # item_2
-        ]
+        # Mock clothing items exist and are owned by the user
+        mock_firestore_helper.verify_owned_documents.return_value = {"item_1", "item_2"}
         mock_firestore_helper.create_document.return_value = True
 
         result = await OutfitService.create_outfit("user_456", sample_outfit_create)
@@ -352,14 +440,16 @@ class TestOutfitService:
         assert result.name == "Casual Friday"
         assert len(result.clothing_item_ids) == 2
 
-        # Verify clothing items were checked
-        assert mock_firestore_helper.get_document.call_count == 2
+        # Verify clothing items were checked in a single ownership query
+        mock_firestore_helper.verify_owned_documents.assert_called_once_with(
+            "clothing_items", "user_uid", "user_456", ["item_1", "item_2"]
+        )
         mock_firestore_helper.create_document.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_create_outfit_clothing_item_not_found(self, mock_firestore_helper, sample_outfit_create):
         """Test outfit creation when clothing item doesn't exist"""
-        mock_firestore_helper.get_document.return_value = None
+        mock_firestore_helper.verify_owned_documents.return_value = set()
 
         with pytest.raises(HTTPException) as exc_info:
             await OutfitService.create_outfit("user_456", sample_outfit_create)
@@ -370,19 +460,15 @@ class TestOutfitService:
     @pytest.mark.asyncio
     async def test_create_outfit_wrong_user_clothing_item(self, mock_firestore_helper, sample_outfit_create):
         """Test outfit creation with clothing item belonging to wrong user"""
-        wrong_user_item = {
-            "id": "item_1",
-            "user_uid": "wrong_user",
-            "name": "Test Item",
-            "category": "tops"
-        }
-        mock_firestore_helper.get_document.return_value = wrong_user_item
+        # The ownership query only returns ids owned by the caller, so
+        # another user's items simply don't come back
+        mock_firestore_helper.verify_owned_documents.return_value = set()
 
         with pytest.raises(HTTPException) as exc_info:
             await OutfitService.create_outfit("user_456", sample_outfit_create)
 
         assert exc_info.value.status_code == 400
-        assert "Access denied" in exc_info.value.detail
+        assert "not found or not owned" in exc_info.value.detail
 
     @pytest.mark.asyncio
     async def test_get_outfit_success(self, mock_firestore_helper, sample_outfit_doc):
@@ -456,16 +542,15 @@ class TestOutfitService:
     async def test_increment_outfit_wear_count_success(self, mock_firestore_helper, sample_outfit_doc):
         """Test successful outfit wear count increment"""
         mock_firestore_helper.get_document.return_value = sample_outfit_doc
-        mock_firestore_helper.update_document.return_value = True
-
-        # Mock ClothingItemService.increment_wear_count
-        with patch('app.services.wardrobe_service.ClothingItemService.increment_wear_count') as mock_increment:
-            mock_increment.return_value = True
+        mock_firestore_helper.batch_increment.return_value = True
 
-            result = await OutfitService.increment_wear_count("user_456", "outfit_123")
+        result = await OutfitService.increment_wear_count("user_456", "outfit_123")
 
-            assert result is True
+        assert result is True
 
-            # Verify clothing items' wear counts were incremented
-            assert mock_increment.call_count == 2  # Two items in outfit
-            mock_firestore_helper.update_document.assert_called_once()
\ No newline at end of file
+        # Outfit and per-item counters go out in one batched commit
+        mock_firestore_helper.batch_increment.assert_called_once()
+        ops = mock_firestore_helper.batch_increment.call_args.args[0]
+        assert ops[0][:3] == ("outfits", "outfit_123", "wear_count")
+        assert [op[1] for op in ops[1:]] == sample_outfit_doc["clothing_item_ids"]
+        assert all(op[0] == "clothing_items" and op[2] == "wear_count" for op in ops[1:])
\ No newline at end of file